@@ -246,6 +246,7 @@ class BotCommands(BaseCog):
                 "`!clear` - Clear all signals\n"
                 "`!cleanalerts` - Purge past 7 days from alert channels\n"
                 "`!reload` - Reload configuration\n"
+                "`!trace` - Toggle alert-reply debug tracing\n"
                 "`!shutdown` - Shutdown bot\n"
                 "`!goldtollssl [value]` - Get/set gold tolls SL offset ($)"
             )
@@ -538,6 +539,19 @@ class BotCommands(BaseCog):
             await ctx.send(f"❌ Error reloading config: {str(e)}")
             self.logger.error(f"Error reloading config: {e}")
 
+    @commands.command(name='trace')
+    @commands.check(lambda ctx: ctx.cog.is_admin(ctx.author))
+    async def toggle_trace(self, ctx: commands.Context):
+        """Toggle debug tracing of alert-reply handling (Admin only)"""
+        handler = self.bot.message_handler
+        if not handler:
+            await ctx.send("❌ Message handler not initialized")
+            return
+
+        handler.TRACE = not handler.TRACE
+        await ctx.send(f"✅ Alert-reply tracing {'enabled' if handler.TRACE else 'disabled'}")
+        self.logger.info(f"Alert-reply tracing set to {handler.TRACE} by {ctx.author.name}")
+
     @commands.command(name='shutdown')
     @commands.check(lambda ctx: ctx.cog.is_admin(ctx.author))
     async def shutdown(self, ctx: commands.Context):
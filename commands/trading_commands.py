@@ -168,9 +168,24 @@ class TradingCommands(BaseCog):
     def __init__(self, bot):
         super().__init__(bot)
         self.tp_config = TPConfig()
-        self.alert_dist_config = AlertDistanceConfig()
+        # Share the live monitor's instance so edits apply without a reload
+        # from disk (the cog is loaded after the monitor starts)
+        monitor = getattr(bot, 'monitor', None)
+        self.alert_dist_config = getattr(monitor, 'alert_config', None) or AlertDistanceConfig()
         self.nm_config = NMConfig()
 
+    async def cog_unload(self):
+        """Write any debounced alert distance edits (covers the no-monitor fallback instance)"""
+        self.alert_dist_config.flush()
+
+    def _sync_monitor_alert_config(self):
+        """Reload the monitor's alert config if it isn't the instance we edit"""
+        monitor = getattr(self.bot, 'monitor', None)
+        monitor_config = getattr(monitor, 'alert_config', None)
+        if monitor_config is not None and monitor_config is not self.alert_dist_config:
+            self.alert_dist_config.flush()
+            monitor_config.reload_config()
+
     @commands.command(name="signal")
     async def add_signal(
             self,
@@ -283,8 +298,7 @@ class TradingCommands(BaseCog):
             if hasattr(self.bot, 'monitor') and self.bot.monitor:
                 if hasattr(self.bot.monitor, 'stream_manager') and signal.get('pending_limits'):
                     try:
-                        from price_feeds.alert_config import AlertDistanceConfig
-                        alert_config = AlertDistanceConfig()
+                        alert_config = self.alert_dist_config
 
                         symbol = signal['instrument']
                         cached_price = await self.bot.monitor.stream_manager.get_latest_price(symbol)
@@ -535,7 +549,7 @@ class TradingCommands(BaseCog):
                 if hit_limits and stop_price:
                     combined = 0.0
                     for lim in hit_limits:
-                        entry = lim.get('hit_price') or lim.get('price_level')
+                        entry = lim['effective_price']
                         if entry is not None:
                             combined += self.tp_config.calculate_pnl(
                                 signal['instrument'], signal['direction'], entry, stop_price,
@@ -1969,7 +1983,7 @@ class TradingCommands(BaseCog):
                     return
                 self.alert_dist_config.config['defaults'][target_lower]['value'] = float_value
                 self.alert_dist_config.config['defaults'][target_lower]['type'] = dist_type_lower
-                self.alert_dist_config._save_config()
+                self.alert_dist_config.save_soon()
                 label = f"**{target_lower}** (default)"
             else:
                 # Set per-symbol override
@@ -1990,9 +2004,7 @@ class TradingCommands(BaseCog):
                 val_display = f"{float_value} pips"
 
             # Reload live monitor config
-            if hasattr(self.bot, 'monitor') and self.bot.monitor:
-                if hasattr(self.bot.monitor, 'alert_config'):
-                    self.bot.monitor.alert_config.reload_config()
+            self._sync_monitor_alert_config()
 
             embed = discord.Embed(title="Alert Distance Updated", color=discord.Color.green())
             embed.add_field(name="Target", value=label, inline=True)
@@ -2011,9 +2023,7 @@ class TradingCommands(BaseCog):
             symbol_upper = symbol.upper()
             removed = self.alert_dist_config.remove_override(symbol_upper)
 
-            if hasattr(self.bot, 'monitor') and self.bot.monitor:
-                if hasattr(self.bot.monitor, 'alert_config'):
-                    self.bot.monitor.alert_config.reload_config()
+            self._sync_monitor_alert_config()
 
             if removed:
                 fallback_cfg = self.alert_dist_config._get_config_for_symbol(symbol_upper)
@@ -3,7 +3,7 @@ Trading Bot Core - Main bot class
 """
 import discord
 from discord.ext import commands, tasks
-from typing import Optional, Set
+from typing import FrozenSet, Optional
 from utils.logger import get_logger
 from utils.config_loader import config
 from database import db
@@ -30,6 +30,9 @@ class TradingBot(commands.Bot):
         super().__init__(
             command_prefix=settings.get("bot_prefix", "!"),
             intents=intents,
+            # Larger message cache so replies usually resolve via
+            # reference.cached_message instead of a fetch_message call
+            max_messages=settings.get("message_cache_size", 5000),
             help_command=None  # We have a custom help command
         )
 
@@ -37,7 +40,7 @@ class TradingBot(commands.Bot):
         self.logger = get_logger("bot")
         self.settings = settings
         self.channels_config = None
-        self.monitored_channels: Set[int] = set()
+        self.monitored_channels: FrozenSet[int] = frozenset()
         self.alert_channel_id: Optional[int] = None
         self.command_channel_id: Optional[int] = None
         self.signal_db = None
@@ -71,6 +74,7 @@ class TradingBot(commands.Bot):
 
         from discord_handlers.message_handler import MessageHandler
         self.message_handler = MessageHandler(self)
+        await self.message_handler.load_known_message_ids()
         self.logger.info("Message handler initialized")
 
         await self.initialize_price_monitor()
@@ -100,12 +104,13 @@ class TradingBot(commands.Bot):
         """Load configuration from files"""
         self.channels_config = config.load("channels.json")
 
-        # Set up monitored channels
-        self.monitored_channels.clear()
+        # Set up monitored channels (rebuilt as a frozenset of ints on each load)
+        monitored = set()
         for channel_name, channel_id in self.channels_config.get("monitored_channels", {}).items():
             if channel_id:
-                self.monitored_channels.add(int(channel_id))
+                monitored.add(int(channel_id))
                 self.logger.info(f"Monitoring channel: {channel_name} ({channel_id})")
+        self.monitored_channels = frozenset(monitored)
 
         # Set alert channel
         alert_id = self.channels_config.get("alert_channel")
@@ -119,6 +124,10 @@ class TradingBot(commands.Bot):
             self.command_channel_id = int(command_id)
             self.logger.info(f"Command channel set: {command_id}")
 
+        # Keep the message handler's channel lookups in sync on reload
+        if self.message_handler:
+            self.message_handler.refresh_channel_map()
+
     async def load_extensions(self):
         """Load all command cogs"""
         extensions = [
@@ -138,6 +147,9 @@ class TradingBot(commands.Bot):
         self.logger.info(f"Bot logged in as {self.user.name} ({self.user.id})")
         self.logger.info(f"Connected to {len(self.guilds)} guild(s)")
 
+        if self.message_handler:
+            self.message_handler.refresh_bot_user()
+
         # Ensure alert system connection is valid (guard against race conditions)
         if self.monitor and self.message_handler and not self.message_handler.alert_system:
             self.message_handler.alert_system = self.monitor.alert_system
@@ -306,8 +318,14 @@ class TradingBot(commands.Bot):
             self.news_manager.stop_cleanup_task()
 
         if self.monitor:
+            # Write any debounced alert distance edits before exiting
+            if getattr(self.monitor, 'alert_config', None):
+                self.monitor.alert_config.flush()
             await self.monitor.stop()
 
+        if self.message_handler:
+            await self.message_handler.stop()
+
         # Close database connection
         if db:
             await db.close()
@@ -51,6 +51,18 @@ class RejectedSignal:
         return False  # still falsy so existing `if result:` guards stay safe
 
 
+class UnparsedSignal:
+    """
+    Sentinel returned when a message passes pre-validation (numbers plus
+    trading keywords, not excluded) but no parser could extract a signal.
+
+    Distinct from None (which means "not a signal at all") so that callers
+    can react with ⚠️ without re-scanning the message themselves.
+    """
+    def __bool__(self):
+        return False
+
+
 class LimitsOrderError(Exception):
     """Raised by pattern parsers when limit prices are out of the expected order."""
     pass
@@ -234,6 +246,7 @@ class EnhancedSignalParser:
             )
         else:
             logger.debug(f"Failed to parse: {message[:100]}...")
+            return UnparsedSignal()
 
         return result
 
@@ -333,7 +346,7 @@ def parse_signal(message: str, channel_name: str = None) -> Optional[ParsedSigna
         channel_name: Discord channel name
 
     Returns:
-        ParsedSignal object or None
+        ParsedSignal, RejectedSignal / UnparsedSignal (falsy) or None
     """
     parser = get_parser()
     return parser.parse(message, channel_name)
@@ -351,6 +364,7 @@ def cleanup_parser():
 __all__ = [
     'ParsedSignal',
     'RejectedSignal',
+    'UnparsedSignal',
     'LimitsOrderError',
     'EnhancedSignalParser',
     'parse_signal',
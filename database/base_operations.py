@@ -283,13 +283,15 @@ class BaseOperations:
     async def get_hit_limits_for_signal(self, signal_id: int) -> List[Dict[str, Any]]:
         """
         Return all hit limits for a signal ordered by sequence_number.
-        Includes hit_price (actual fill price) for P&L calculations.
+        Includes hit_price (actual fill price) and effective_price
+        (hit_price, falling back to price_level) for P&L calculations.
         """
         query = """
             SELECT id AS limit_id,
                    sequence_number,
                    price_level,
                    hit_price,
+                   effective_price,
                    hit_time
             FROM limits
             WHERE signal_id = $1 AND status = 'hit'
@@ -165,6 +165,35 @@ async def _run_migrations(conn):
         END $$;
         """,
 
+        # Add parsed_payload column to signals table — the parsed signal as
+        # saved, so reactivation doesn't need to re-parse the message
+        """
+        DO $$
+        BEGIN
+            IF NOT EXISTS (
+                SELECT 1 FROM information_schema.columns
+                WHERE table_name = 'signals' AND column_name = 'parsed_payload'
+            ) THEN
+                ALTER TABLE signals ADD COLUMN parsed_payload JSONB;
+            END IF;
+        END $$;
+        """,
+
+        # Add effective_price generated column to limits table — the fill
+        # price if recorded, else the limit level (used for P&L sums)
+        """
+        DO $$
+        BEGIN
+            IF NOT EXISTS (
+                SELECT 1 FROM information_schema.columns
+                WHERE table_name = 'limits' AND column_name = 'effective_price'
+            ) THEN
+                ALTER TABLE limits ADD COLUMN effective_price DOUBLE PRECISION
+                    GENERATED ALWAYS AS (COALESCE(hit_price, price_level)) STORED;
+            END IF;
+        END $$;
+        """,
+
         # License system — per-user key allowance table
         """
         CREATE TABLE IF NOT EXISTS license_allowances (
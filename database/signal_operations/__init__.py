@@ -1,7 +1,7 @@
 """
 Signal-specific database operations main module
 """
-from typing import Optional, List, Dict, Any, Tuple
+from typing import Callable, Optional, List, Dict, Any, Tuple
 from core.parser import ParsedSignal
 from utils.logger import get_logger
 
@@ -59,6 +59,30 @@ class SignalDatabase:
         """
         return await self._crud.get_signal_by_message_id(message_id)
 
+    async def get_signals_by_message_ids(self, message_ids: List[str]) -> Dict[str, Dict[str, Any]]:
+        """
+        Get signals for several Discord message IDs in one query
+
+        Args:
+            message_ids: Discord message IDs
+
+        Returns:
+            Dict of message_id -> signal data (IDs without a signal are omitted)
+        """
+        return await self._crud.get_signals_by_message_ids(message_ids)
+
+    async def get_recent_message_ids(self, days: int = 7) -> List[str]:
+        """
+        Get the Discord message IDs of recently created signals
+
+        Args:
+            days: How far back to look
+
+        Returns:
+            Message IDs, oldest first
+        """
+        return await self._crud.get_recent_message_ids(days)
+
     async def get_signal_with_limits(self, signal_id: int) -> Optional[Dict[str, Any]]:
         """
         Get signal with all its limits (including hit ones)
@@ -185,6 +209,38 @@ class SignalDatabase:
             result_pips=result_pips, closed_reason=closed_reason
         )
 
+    async def close_signal_as_stoploss(self, signal_id: int, reason: str,
+                                       pnl_calculator: Callable[..., float]) -> bool:
+        """
+        Manually close a signal as stop_loss in one transaction, summing the
+        P&L of its hit limits at the stop price
+
+        Args:
+            signal_id: Signal ID
+            reason: Reason recorded in status_changes
+            pnl_calculator: Batch P&L function, e.g. TPConfig.calculate_pnl_batch
+
+        Returns:
+            Success status
+        """
+        return await self._lifecycle.close_signal_as_stoploss(
+            signal_id, reason, self.db, pnl_calculator
+        )
+
+    async def manually_set_signal_status_many(self, updates: List[Tuple[int, str, Optional[str],
+                                                                    Optional[float], Optional[str]]]) -> List[bool]:
+        """
+        Apply several manual status overrides in one transaction
+
+        Args:
+            updates: (signal_id, new_status, reason, result_pips, closed_reason) tuples,
+                     at most one per signal ID
+
+        Returns:
+            Success status per update, in input order
+        """
+        return await self._lifecycle.manually_set_signal_statuses(updates, self.db)
+
     async def process_limit_hit(self, limit_id: int, actual_price: float = None) -> Dict[str, Any]:
         """
         Process a limit hit event
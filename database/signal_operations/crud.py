@@ -65,7 +65,7 @@ class CrudOperations:
                     return False, existing['id']
 
             # Calculate expiry time
-            from .utils import calculate_expiry
+            from .utils import calculate_expiry, serialize_parsed_signal
             expiry_time = calculate_expiry(parsed_signal.expiry_type)
 
             # Insert signal and its limits atomically in a single transaction
@@ -88,9 +88,10 @@ class CrudOperations:
                     """
                     INSERT INTO signals (
                         message_id, channel_id, instrument, direction,
-                        stop_loss, expiry_type, expiry_time, total_limits, status, scalp
+                        stop_loss, expiry_type, expiry_time, total_limits, status, scalp,
+                        parsed_payload
                     )
-                    VALUES ($1, $2, $3, $4, $5, $6, $7, $8, $9, $10)
+                    VALUES ($1, $2, $3, $4, $5, $6, $7, $8, $9, $10, $11)
                     RETURNING id
                     """,
                     message_id, channel_id,
@@ -100,6 +101,7 @@ class CrudOperations:
                     len(parsed_signal.limits) if parsed_signal.limits else 0,
                     SignalStatus.ACTIVE,
                     getattr(parsed_signal, 'scalp', False),
+                    serialize_parsed_signal(parsed_signal),
                 )
 
                 if signal_id and parsed_signal.limits:
@@ -135,6 +137,40 @@ class CrudOperations:
         query = "SELECT * FROM signals WHERE message_id = $1"
         return await self.db.fetch_one(query, (message_id,))
 
+    async def get_signals_by_message_ids(self, message_ids: List[str]) -> Dict[str, Dict[str, Any]]:
+        """
+        Get signals for several Discord message IDs in one query
+
+        Args:
+            message_ids: Discord message IDs
+
+        Returns:
+            Dict of message_id -> signal data (IDs without a signal are omitted)
+        """
+        if not message_ids:
+            return {}
+        query = "SELECT * FROM signals WHERE message_id = ANY($1::text[])"
+        rows = await self.db.fetch_all(query, (list(message_ids),))
+        return {row['message_id']: row for row in rows}
+
+    async def get_recent_message_ids(self, days: int = 7) -> List[str]:
+        """
+        Get the Discord message IDs of recently created signals
+
+        Args:
+            days: How far back to look
+
+        Returns:
+            Message IDs, oldest first
+        """
+        query = """
+            SELECT message_id FROM signals
+            WHERE created_at > NOW() - make_interval(days => $1)
+            ORDER BY created_at
+        """
+        rows = await self.db.fetch_all(query, (days,))
+        return [row['message_id'] for row in rows]
+
     async def get_signal_with_limits(self, signal_id: int) -> Optional[Dict[str, Any]]:
         """
         Get signal with all its limits (including hit ones)
@@ -194,6 +230,8 @@ class CrudOperations:
                 logger.warning(f"Cannot update signal {signal_id} in final status {existing['status']}")
                 return False
 
+            from .utils import serialize_parsed_signal
+
             async with self.db.get_connection() as conn:
                 # Update signal basic info
                 await conn.execute(
@@ -201,12 +239,13 @@ class CrudOperations:
                     UPDATE signals
                     SET instrument = $1, direction = $2, stop_loss = $3,
                         expiry_type = $4, total_limits = $5, scalp = $6,
-                        updated_at = CURRENT_TIMESTAMP
-                    WHERE id = $7
+                        parsed_payload = $7, updated_at = CURRENT_TIMESTAMP
+                    WHERE id = $8
                     """,
                     parsed_signal.instrument, parsed_signal.direction,
                     parsed_signal.stop_loss, parsed_signal.expiry_type,
                     len(parsed_signal.limits), getattr(parsed_signal, 'scalp', False),
+                    serialize_parsed_signal(parsed_signal),
                     signal_id,
                 )
 
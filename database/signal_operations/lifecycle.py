@@ -1,7 +1,7 @@
 """
 Signal lifecycle management operations
 """
-from typing import Dict, Any
+from typing import Callable, Dict, Any, List, Optional, Tuple
 from datetime import datetime
 import pytz
 from database.models import SignalStatus
@@ -282,6 +282,211 @@ class LifecycleManager:
             logger.error(f"Error manually setting signal status: {e}", exc_info=True)
             return False
 
+    async def close_signal_as_stoploss(self, signal_id: int, reason: str, db_manager,
+                                       pnl_calculator: Callable[..., float]) -> bool:
+        """
+        Manually close a signal as stop_loss, recording the P&L of its hit limits
+
+        The signal row, its hit limits and all writes share one connection
+        and transaction instead of a separate read and status update.
+
+        Args:
+            signal_id: Signal ID
+            reason: Reason recorded in status_changes
+            db_manager: Database manager instance
+            pnl_calculator: Called as (instrument, direction, entry_prices, stop_price, scalp=...)
+                            and returns the summed P&L (e.g. TPConfig.calculate_pnl_batch)
+
+        Returns:
+            Success status
+        """
+        try:
+            async with db_manager.get_connection() as conn:
+                signal = await conn.fetchrow(
+                    "SELECT * FROM signals WHERE id = $1 FOR UPDATE", signal_id
+                )
+                if not signal:
+                    logger.error(f"Signal {signal_id} not found")
+                    return False
+
+                old_status = signal['status']
+                if old_status == SignalStatus.STOP_LOSS:
+                    logger.info(f"Signal {signal_id} already has status {SignalStatus.STOP_LOSS}")
+                    return True
+
+                result_pips = None
+                if signal['stop_loss']:
+                    entries = [
+                        row['effective_price'] for row in await conn.fetch(
+                            """
+                            SELECT effective_price
+                            FROM limits
+                            WHERE signal_id = $1 AND status = 'hit'
+                            """,
+                            signal_id
+                        )
+                        if row['effective_price'] is not None
+                    ]
+                    if entries:
+                        try:
+                            result_pips = pnl_calculator(
+                                signal['instrument'], signal['direction'], entries,
+                                signal['stop_loss'], scalp=signal['scalp'] or False
+                            )
+                        except Exception as e:
+                            logger.warning(f"Could not calculate SL result_pips for signal {signal_id}: {e}")
+
+                now = datetime.now(pytz.UTC)
+                await conn.execute("""
+                    UPDATE signals
+                    SET status = $1, updated_at = $2, closed_at = $2,
+                        closed_reason = 'manual', result_pips = $3
+                    WHERE id = $4
+                """, SignalStatus.STOP_LOSS, now, result_pips, signal_id)
+                await conn.execute("""
+                    INSERT INTO status_changes (signal_id, old_status, new_status, change_type, reason)
+                    VALUES ($1, $2, $3, 'manual', $4)
+                """, signal_id, old_status, SignalStatus.STOP_LOSS, reason or 'Manual override')
+                await conn.execute("""
+                    UPDATE limits
+                    SET status = 'cancelled'
+                    WHERE signal_id = $1 AND status = 'pending'
+                """, signal_id)
+
+            logger.info(f"Successfully set signal {signal_id} status: {old_status} -> {SignalStatus.STOP_LOSS}"
+                        + (f" (result_pips={result_pips:.4f})" if result_pips is not None else ""))
+            return True
+
+        except Exception as e:
+            logger.error(f"Error closing signal {signal_id} as stop loss: {e}", exc_info=True)
+            return False
+
+    async def manually_set_signal_statuses(self, updates: List[Tuple[int, str, Optional[str],
+                                                                    Optional[float], Optional[str]]],
+                                           db_manager) -> List[bool]:
+        """
+        Apply several manual status overrides in a single transaction
+
+        Same semantics as manually_set_signal_status for each entry, but the
+        current statuses are read (and row-locked) with one query in the same
+        transaction as the writes, which are issued with executemany. Each
+        signal ID may appear at most once.
+
+        Args:
+            updates: (signal_id, new_status, reason, result_pips, closed_reason) tuples
+            db_manager: Database manager instance
+
+        Returns:
+            Success status per update, in input order
+        """
+        results = [False] * len(updates)
+        try:
+            signal_ids = [u[0] for u in updates]
+            if len(set(signal_ids)) != len(signal_ids):
+                logger.error("Duplicate signal IDs in batched status update")
+                return results
+
+            async with db_manager.get_connection() as conn:
+                # Lock the rows for the rest of the transaction so the old
+                # statuses read here can't change before the writes below
+                rows = await conn.fetch(
+                    "SELECT id, status FROM signals WHERE id = ANY($1::bigint[]) FOR UPDATE",
+                    signal_ids
+                )
+                old_statuses = {r['id']: r['status'] for r in rows}
+
+                now = datetime.now(pytz.UTC)
+                final_with_pips, final_without_pips, reopened = [], [], []
+                status_changes, cancel_limits, reactivate_limits = [], [], []
+                applied = []
+
+                for idx, (signal_id, new_status, reason, result_pips, closed_reason) in enumerate(updates):
+                    if not SignalStatus.is_valid(new_status):
+                        logger.error(f"Invalid status: {new_status}")
+                        continue
+
+                    old_status = old_statuses.get(signal_id)
+                    if old_status is None:
+                        logger.error(f"Signal {signal_id} not found")
+                        continue
+
+                    if old_status == new_status:
+                        logger.info(f"Signal {signal_id} already has status {new_status}")
+                        results[idx] = True
+                        continue
+
+                    effective_closed_reason = closed_reason if closed_reason is not None else 'manual'
+
+                    if SignalStatus.is_final(new_status):
+                        if result_pips is not None:
+                            final_with_pips.append(
+                                (new_status, now, now, effective_closed_reason, result_pips, signal_id)
+                            )
+                        else:
+                            final_without_pips.append(
+                                (new_status, now, now, effective_closed_reason, signal_id)
+                            )
+                        cancel_limits.append((signal_id,))
+                    else:
+                        reopened.append((new_status, now, signal_id))
+                        if new_status == SignalStatus.ACTIVE:
+                            reactivate_limits.append((signal_id,))
+
+                    status_changes.append(
+                        (signal_id, old_status, new_status, effective_closed_reason,
+                         reason or 'Manual override')
+                    )
+                    applied.append((idx, signal_id, old_status, new_status))
+
+                if not applied:
+                    return results
+
+                if final_with_pips:
+                    await conn.executemany("""
+                        UPDATE signals 
+                        SET status = $1, updated_at = $2, closed_at = $3,
+                            closed_reason = $4, result_pips = $5
+                        WHERE id = $6
+                    """, final_with_pips)
+                if final_without_pips:
+                    await conn.executemany("""
+                        UPDATE signals 
+                        SET status = $1, updated_at = $2, closed_at = $3, closed_reason = $4
+                        WHERE id = $5
+                    """, final_without_pips)
+                if reopened:
+                    await conn.executemany("""
+                        UPDATE signals 
+                        SET status = $1, updated_at = $2, closed_at = NULL,
+                            closed_reason = NULL, result_pips = NULL
+                        WHERE id = $3
+                    """, reopened)
+                await conn.executemany("""
+                    INSERT INTO status_changes (signal_id, old_status, new_status, change_type, reason)
+                    VALUES ($1, $2, $3, $4, $5)
+                """, status_changes)
+                if cancel_limits:
+                    await conn.executemany("""
+                        UPDATE limits 
+                        SET status = 'cancelled' 
+                        WHERE signal_id = $1 AND status = 'pending'
+                    """, cancel_limits)
+                if reactivate_limits:
+                    await conn.executemany("""
+                        UPDATE limits 
+                        SET status = 'pending' 
+                        WHERE signal_id = $1 AND status = 'cancelled'
+                    """, reactivate_limits)
+
+            for idx, signal_id, old_status, new_status in applied:
+                results[idx] = True
+                logger.info(f"Successfully set signal {signal_id} status: {old_status} -> {new_status}")
+            return results
+
+        except Exception as e:
+            logger.error(f"Error applying batched status updates: {e}", exc_info=True)
+            return [False] * len(updates)
+
     async def manually_set_signal_to_hit(self, signal_id: int, reason: str) -> bool:
         """
         Manually mark a signal as HIT by marking its first pending limit as hit.
@@ -0,0 +1,110 @@
+"""
+Coalesces signal-by-message-ID lookups into batched DB queries
+"""
+import asyncio
+from typing import Any, Dict, List, Optional, Tuple
+from utils.logger import get_logger
+
+logger = get_logger("signal_db.lookup_batcher")
+
+# How long to wait for more lookups before querying (seconds)
+FLUSH_INTERVAL = 0.005
+
+# Maximum number of message IDs per query
+MAX_BATCH_SIZE = 100
+
+
+class SignalLookupBatcher:
+    """
+    Queues get_signal_by_message_id calls and answers them together.
+
+    Reply-to-manage bursts (several replies landing within a few ms) would
+    otherwise each run their own query. Lookups that arrive within
+    FLUSH_INTERVAL of each other share one get_signals_by_message_ids query;
+    a lone lookup still uses the single-row query.
+    """
+
+    def __init__(self, signal_db):
+        """
+        Args:
+            signal_db: SignalDatabase instance
+        """
+        self.signal_db = signal_db
+        self._queue: Optional[asyncio.Queue] = None
+        self._task: Optional[asyncio.Task] = None
+        self._inflight: List[Tuple[str, asyncio.Future]] = []
+
+    def _ensure_started(self):
+        """Start the flush loop on first use (needs a running event loop)"""
+        if self._task is None or self._task.done():
+            self._queue = asyncio.Queue()
+            self._task = asyncio.create_task(self._flush_loop(), name="signal_lookup_batcher")
+
+    async def get_signal_by_message_id(self, message_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Queue a lookup and wait for its result
+
+        Args:
+            message_id: Discord message ID
+
+        Returns:
+            Signal data or None
+        """
+        self._ensure_started()
+        future = asyncio.get_running_loop().create_future()
+        self._queue.put_nowait((message_id, future))
+        return await future
+
+    async def stop(self):
+        """Cancel the flush loop, answering any lookups in flight or queued with None"""
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+        for _, future in self._inflight:
+            if not future.done():
+                future.set_result(None)
+        self._inflight = []
+
+        while self._queue is not None and not self._queue.empty():
+            _, future = self._queue.get_nowait()
+            if not future.done():
+                future.set_result(None)
+
+    async def _flush_loop(self):
+        """Background task: gather queued lookups and query them in batches"""
+        while True:
+            batch = [await self._queue.get()]
+            # A lone lookup is answered straight away; only wait for the
+            # batching window when a burst is already arriving
+            if not self._queue.empty():
+                await asyncio.sleep(FLUSH_INTERVAL)
+                while len(batch) < MAX_BATCH_SIZE and not self._queue.empty():
+                    batch.append(self._queue.get_nowait())
+            self._inflight = batch
+            await self._run_batch(batch)
+            self._inflight = []
+
+    async def _run_batch(self, batch: List[Tuple[str, asyncio.Future]]):
+        """Run one batch of lookups and resolve their waiters"""
+        message_ids = list(dict.fromkeys(message_id for message_id, _ in batch))
+        try:
+            if len(message_ids) == 1:
+                signal = await self.signal_db.get_signal_by_message_id(message_ids[0])
+                found = {message_ids[0]: signal} if signal else {}
+            else:
+                found = await self.signal_db.get_signals_by_message_ids(message_ids)
+                logger.debug(f"Looked up {len(message_ids)} signals in one query")
+        except Exception as e:
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+            return
+
+        for message_id, future in batch:
+            if not future.done():
+                future.set_result(found.get(message_id))
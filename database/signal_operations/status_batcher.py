@@ -0,0 +1,119 @@
+"""
+Coalesces manual signal status overrides into batched DB transactions
+"""
+import asyncio
+from typing import List, Optional, Tuple
+from utils.logger import get_logger
+
+logger = get_logger("signal_db.status_batcher")
+
+# How long to wait for more updates before flushing (seconds)
+FLUSH_INTERVAL = 0.05
+
+# Maximum number of updates written per transaction
+MAX_BATCH_SIZE = 50
+
+
+class SignalStatusBatcher:
+    """
+    Queues manually_set_signal_status calls and flushes them together.
+
+    When moderators close many signals in quick succession (e.g. after a
+    news event) each reply would otherwise be its own transaction. Updates
+    that arrive within FLUSH_INTERVAL of each other are written with a
+    single manually_set_signal_status_many call instead.
+    """
+
+    def __init__(self, signal_db):
+        """
+        Args:
+            signal_db: SignalDatabase instance
+        """
+        self.signal_db = signal_db
+        self._queue: Optional[asyncio.Queue] = None
+        self._task: Optional[asyncio.Task] = None
+
+    def _ensure_started(self):
+        """Start the flush loop on first use (needs a running event loop)"""
+        if self._task is None or self._task.done():
+            self._queue = asyncio.Queue()
+            self._task = asyncio.create_task(self._flush_loop(), name="signal_status_batcher")
+
+    async def set_status(self, signal_id: int, new_status: str, reason: str = None,
+                         result_pips: float = None, closed_reason: str = None) -> bool:
+        """
+        Queue a manual status override and wait for it to be written
+
+        Args:
+            signal_id: Signal ID
+            new_status: New status to set
+            reason: Optional reason for manual change
+            result_pips: Optional P&L in pips or dollars to record on the signal
+            closed_reason: Override for closed_reason column
+
+        Returns:
+            Success status
+        """
+        self._ensure_started()
+        future = asyncio.get_running_loop().create_future()
+        self._queue.put_nowait(((signal_id, new_status, reason, result_pips, closed_reason), future))
+        return await future
+
+    async def stop(self):
+        """Cancel the flush loop, failing any updates still queued"""
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+        while self._queue is not None and not self._queue.empty():
+            _, future = self._queue.get_nowait()
+            if not future.done():
+                future.set_result(False)
+
+    async def _flush_loop(self):
+        """Background task: gather queued updates and write them in batches"""
+        held_over: List[Tuple[tuple, asyncio.Future]] = []
+        while True:
+            if not held_over:
+                held_over.append(await self._queue.get())
+                await asyncio.sleep(FLUSH_INTERVAL)
+
+            pending = held_over
+            while len(pending) < MAX_BATCH_SIZE and not self._queue.empty():
+                pending.append(self._queue.get_nowait())
+
+            # A signal can only be updated once per transaction; repeats wait
+            # for the next batch so their old_status is read correctly.
+            # Waiters that gave up (command_timeout) are dropped so the caller
+            # is never told "timed out" for an update that was then written
+            batch, held_over, seen = [], [], set()
+            for item in pending:
+                if item[1].done():
+                    continue
+                if item[0][0] in seen or len(batch) >= MAX_BATCH_SIZE:
+                    held_over.append(item)
+                else:
+                    seen.add(item[0][0])
+                    batch.append(item)
+
+            if batch:
+                await self._write_batch(batch)
+
+    async def _write_batch(self, batch: List[Tuple[tuple, asyncio.Future]]):
+        """Write one batch and resolve its waiters"""
+        try:
+            results = await self.signal_db.manually_set_signal_status_many([u for u, _ in batch])
+        except Exception as e:
+            logger.error(f"Batched status update failed: {e}", exc_info=True)
+            results = [False] * len(batch)
+
+        if len(batch) > 1:
+            logger.debug(f"Flushed {len(batch)} status updates in one transaction")
+
+        for (_, future), result in zip(batch, results):
+            if not future.done():
+                future.set_result(result)
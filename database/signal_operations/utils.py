@@ -1,10 +1,13 @@
 """
 Utility functions for signal operations
 """
+import json
+from dataclasses import asdict
 from typing import Optional
 from datetime import datetime, timedelta
 import pytz
 from database.models import SignalStatus
+from core.parser import ParsedSignal
 
 
 def calculate_expiry(expiry_type: str) -> Optional[str]:
@@ -156,4 +159,36 @@ def calculate_pip_difference(instrument: str, price1: float, price2: float) -> f
         # Most forex pairs use 0.0001 as 1 pip
         pip_size = 0.0001
 
-    return abs(price2 - price1) / pip_size
\ No newline at end of file
+    return abs(price2 - price1) / pip_size
+
+
+def serialize_parsed_signal(parsed_signal: ParsedSignal) -> str:
+    """
+    Serialize a parsed signal for the signals.parsed_payload column
+
+    Args:
+        parsed_signal: Parsed signal object
+
+    Returns:
+        JSON string
+    """
+    return json.dumps(asdict(parsed_signal))
+
+
+def deserialize_parsed_signal(payload) -> Optional[ParsedSignal]:
+    """
+    Rebuild a parsed signal from a stored signals.parsed_payload value
+
+    Args:
+        payload: JSON string (or already-decoded dict) from the DB
+
+    Returns:
+        ParsedSignal or None if nothing usable was stored
+    """
+    if not payload:
+        return None
+    try:
+        data = json.loads(payload) if isinstance(payload, str) else payload
+        return ParsedSignal(**data)
+    except (TypeError, ValueError):
+        return None
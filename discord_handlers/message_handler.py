@@ -1,38 +1,184 @@
 """
 Message Handler
 """
-import re
+import asyncio
 import discord
-from typing import Optional
+from collections import OrderedDict
+from typing import NamedTuple, Optional, Tuple
+
+try:
+    from asyncio import timeout as command_timeout  # Python 3.11+
+except ImportError:
+    from async_timeout import timeout as command_timeout
+from core.parser import parse_signal, RejectedSignal, UnparsedSignal
 from utils.embed_factory import EmbedFactory
 from utils.logger import get_logger
 from price_feeds.tp_config import TPConfig
+from database import db
+from database.signal_operations.status_batcher import SignalStatusBatcher
+from database.signal_operations.lookup_batcher import SignalLookupBatcher
+from database.signal_operations.utils import deserialize_parsed_signal
 
 logger = get_logger("message_handler")
 
+
+# Reaction emojis, built once and reused for every add/remove call
+EMOJI_OK = discord.PartialEmoji(name="✅")
+EMOJI_FAIL = discord.PartialEmoji(name="❌")
+EMOJI_WARN = discord.PartialEmoji(name="⚠️")
+EMOJI_REACTIVATED = discord.PartialEmoji(name="♻️")
+EMOJI_EDITED = discord.PartialEmoji(name="📝")
+EMOJI_LOCKED = discord.PartialEmoji(name="🔒")
+EMOJI_PROFIT = discord.PartialEmoji(name="💰")
+EMOJI_HIT = discord.PartialEmoji(name="🎯")
+EMOJI_BREAKEVEN = discord.PartialEmoji(name="➖")
+EMOJI_STOP_LOSS = discord.PartialEmoji(name="🛑")
+
+
+class _Command(NamedTuple):
+    """A reply-to-manage command"""
+    status: Optional[str]  # Status set by the command (None for reactivate)
+    action: str            # action_taken label used in logs and pings
+    event: str             # alert_system embed event
+    emoji: discord.PartialEmoji  # Reaction / ping emoji
+    add_emojis: Tuple[discord.PartialEmoji, ...]  # Added to the replied-to message on success
+    remove_emojis: Tuple[discord.PartialEmoji, ...] = ()  # Bot reactions removed from it
+
+
+_CANCEL = _Command("cancelled", "cancelled", "cancelled", EMOJI_FAIL,
+                   (EMOJI_FAIL,), (EMOJI_OK,))
+_PROFIT = _Command("profit", "marked as PROFIT", "profit", EMOJI_PROFIT, (EMOJI_PROFIT,))
+_HIT = _Command("hit", "marked as HIT", "hit", EMOJI_HIT, (EMOJI_HIT,))
+_BREAKEVEN = _Command("breakeven", "marked as BREAKEVEN", "breakeven", EMOJI_BREAKEVEN, (EMOJI_BREAKEVEN,))
+_STOP_LOSS = _Command("stop_loss", "marked as STOP LOSS", "stop_loss", EMOJI_STOP_LOSS, (EMOJI_STOP_LOSS,))
+_REACTIVATE = _Command(None, "reactivated", "reactivated", EMOJI_REACTIVATED,
+                       (EMOJI_OK, EMOJI_REACTIVATED), (EMOJI_FAIL,))
+
+# Commands that only set a status, handled the same way for alert and signal replies
+_STATUS_COMMANDS = (_PROFIT, _HIT, _BREAKEVEN, _STOP_LOSS)
+
+# Reply text -> command
+_COMMAND_TABLE = {
+    "cancel": _CANCEL, "nm": _CANCEL, "cancelled": _CANCEL,
+    "profit": _PROFIT, "win": _PROFIT, "tp": _PROFIT,
+    "hit": _HIT,
+    "breakeven": _BREAKEVEN, "be": _BREAKEVEN,
+    "sl": _STOP_LOSS, "stop": _STOP_LOSS, "stoploss": _STOP_LOSS, "stop loss": _STOP_LOSS,
+    "reactivate": _REACTIVATE, "reopen": _REACTIVATE, "active": _REACTIVATE,
+}
+_COMMAND_BY_ACTION = {cmd.action: cmd for cmd in _COMMAND_TABLE.values()}
+
+# Timeout (seconds) for the DB write behind a reply command
+_CMD_TIMEOUT = 5.0
+
+# Signal-reply commands must match an alias exactly, so anything longer is chat
+_MAX_COMMAND_LEN = 32
+
+
+def _normalize_reply(content: str) -> str:
+    """Strip reply text and lowercase it, skipping lower() when it's already lowercase ASCII"""
+    text = content.strip()
+    return text if text.isascii() and text.islower() else text.lower()
+
+
+# Embed title words that mark a bot message as an alert
+_ALERT_TITLE_KEYWORDS = ('approaching', 'hit', 'stop loss')
+
+# Replied-to message IDs known not to be (untracked) alerts, kept in memory
+NON_ALERT_CACHE_MAX = 2048
+
+# Signal message IDs remembered in memory for duplicate detection
+KNOWN_MESSAGE_IDS_MAX = 50_000
+KNOWN_MESSAGE_IDS_DAYS = 7
+
+
 class MessageHandler:
     """Handles all message-related events for signal processing"""
 
+    # Per-step debug tracing in check_alert_management_reply; toggled at
+    # runtime with the admin !trace command
+    TRACE = False
+
     def __init__(self, bot):
         self.bot = bot
         self.logger = bot.logger
         self.signal_db = bot.signal_db
         self.tp_config = TPConfig()
+        # Coalesces manual status overrides issued in quick succession
+        self.status_batcher = SignalStatusBatcher(self.signal_db)
+        # Coalesces reply-to-manage signal lookups that arrive in bursts
+        self.lookup_batcher = SignalLookupBatcher(self.signal_db)
+
+        # Reactions added via safe_add_reaction are queued and drained by one
+        # worker task (started on first use)
+        self._reaction_queue: Optional[asyncio.Queue] = None
+        self._reaction_task: Optional[asyncio.Task] = None
         # We'll need access to the alert system to check alert messages
         self.alert_system = None  # Will be set by monitor when initialized
         logger.info("MessageHandler initialized, alert_system is None initially")
 
+        # Bot's own user, cached for reaction removal and author checks
+        self._bot_user: Optional[discord.ClientUser] = None
+        self._bot_user_id: Optional[int] = None
+        self.refresh_bot_user()
+
+        # Reference IDs already checked and found not to be alerts (LRU)
+        self._non_alert_refs: "OrderedDict[int, None]" = OrderedDict()
+
+        # Signals whose original message returned 404 on a reactivate fetch
+        self._missing_originals: set = set()
+
+        # Message IDs that already have a signal row (LRU, filled by load_known_message_ids)
+        self._known_message_ids: "OrderedDict[str, None]" = OrderedDict()
+
         # Cache allowed channels for quick lookup
         self._allowed_channels = None
 
+        # Reverse map of monitored channel ID -> configured channel name
+        self._channel_name_by_id = {}
+        self.refresh_channel_map()
+
+    def refresh_bot_user(self):
+        """Cache bot.user (call from on_ready, once the client is logged in)"""
+        self._bot_user = self.bot.user
+        self._bot_user_id = self._bot_user.id if self._bot_user else None
+
+    def refresh_channel_map(self):
+        """Rebuild channel lookups from bot.channels_config (call after a config reload)"""
+        self._channel_name_by_id = {
+            int(ch_id): name
+            for name, ch_id in (self.bot.channels_config or {}).get("monitored_channels", {}).items()
+            if ch_id
+        }
+        self._allowed_channels = None
+        # Channels where edits/deletes matter: allowed AND monitored
+        self._active_channel_ids = self.bot.monitored_channels & self._get_allowed_channels()
+
+    async def load_known_message_ids(self):
+        """Seed the duplicate-detection cache with recently saved signal messages"""
+        try:
+            message_ids = await self.signal_db.get_recent_message_ids(KNOWN_MESSAGE_IDS_DAYS)
+        except Exception as e:
+            self.logger.warning("Could not load known signal message IDs: %s", e)
+            return
+        for message_id in message_ids:
+            self._remember_message_id(message_id)
+        self.logger.info(f"Loaded {len(self._known_message_ids)} known signal message IDs")
+
+    def _remember_message_id(self, message_id: str):
+        """Record a message ID as having a signal row, evicting the oldest past the cap"""
+        self._known_message_ids[message_id] = None
+        self._known_message_ids.move_to_end(message_id)
+        if len(self._known_message_ids) > KNOWN_MESSAGE_IDS_MAX:
+            self._known_message_ids.popitem(last=False)
+
     def _get_allowed_channels(self):
         """Get set of allowed channel IDs (monitored + alert + command channels)"""
         if self._allowed_channels is None:
             self._allowed_channels = set()
 
             # Add monitored channels
-            for channel_id in self.bot.monitored_channels:
-                self._allowed_channels.add(channel_id)
+            self._allowed_channels.update(self.bot.monitored_channels)
 
             # Add alert channel
             if hasattr(self.bot, 'alert_channel_id') and self.bot.alert_channel_id:
@@ -76,15 +222,24 @@ class MessageHandler:
         if message.author.bot:
             return
 
-        if not self.is_allowed_channel(message.channel.id):
+        # Only signals (monitored channels) and replies need handling
+        is_monitored = message.channel.id in self.bot.monitored_channels
+        if not (is_monitored or message.reference):
+            return
+
+        # Monitored channels are always allowed
+        if not is_monitored and not self.is_allowed_channel(message.channel.id):
             # Silently ignore messages in non-trading channels
             return
 
-        # Check if message is in monitored channel
-        if message.channel.id in self.bot.monitored_channels:
-            self.logger.info(f"New message in monitored channel: {message.channel.name}")
+        if is_monitored:
+            self.logger.info("New message in monitored channel: %s", message.channel.name)
             await self.process_signal(message)
 
+        # Only replies can be management commands
+        if not message.reference:
+            return
+
         # Check for reply-to-signal management
         await self.check_signal_management_reply(message)
 
@@ -106,56 +261,215 @@ class MessageHandler:
 
             # Skip if this is a manual signal or missing info
             if not message_id or not channel_id or str(message_id).startswith('manual_'):
-                self.logger.debug(f"Skipping original message reaction - manual signal or missing IDs")
+                self.logger.debug("Skipping original message reaction - manual signal or missing IDs")
                 return
 
+            cmd = _COMMAND_BY_ACTION.get(action_taken)
+            if cmd is None:
+                self.logger.debug("No reaction for action %r on original signal", action_taken)
+                return
+
+            # DB stores Discord IDs as text — convert once
+            channel_id = int(channel_id)
+            message_id = int(message_id)
+
             # Fetch the original signal message
             try:
-                channel = self.bot.get_channel(int(channel_id))
+                channel = self.bot.get_channel(channel_id)
                 if not channel:
                     # Try fetching the channel
-                    channel = await self.bot.fetch_channel(int(channel_id))
+                    channel = await self.bot.fetch_channel(channel_id)
 
                 if not channel:
-                    self.logger.warning(f"Could not find channel {channel_id} for original signal")
+                    self.logger.warning("Could not find channel %s for original signal", channel_id)
                     return
 
-                original_message = await channel.fetch_message(int(message_id))
+                original_message = await channel.fetch_message(message_id)
 
             except discord.NotFound:
-                self.logger.warning(f"Original signal message {message_id} not found")
+                self.logger.warning("Original signal message %s not found", message_id)
                 return
             except discord.Forbidden:
-                self.logger.warning(f"No permission to access message {message_id}")
+                self.logger.warning("No permission to access message %s", message_id)
                 return
             except Exception as e:
                 self.logger.error(f"Error fetching original message: {e}")
                 return
 
             # Add the appropriate reaction based on action
-            if action_taken == "cancelled":
-                await self.safe_add_reaction(original_message, "❌")
-            elif action_taken == "marked as HIT":
-                await self.safe_add_reaction(original_message, "🎯")
-            elif action_taken == "marked as PROFIT":
-                await self.safe_add_reaction(original_message, "💰")
-            elif action_taken == "marked as BREAKEVEN":
-                await self.safe_add_reaction(original_message, "➖")
-            elif action_taken == "marked as STOP LOSS":
-                await self.safe_add_reaction(original_message, "🛑")
-            elif action_taken == "reactivated":
-                # Remove the X and add check and recycle
-                try:
-                    await original_message.remove_reaction("❌", self.bot.user)
-                except:
-                    pass
-                await self.safe_add_reaction(original_message, "♻️")
-
-            self.logger.info(f"Added reaction to original signal message {message_id} for action: {action_taken}")
+            if cmd is _REACTIVATE:
+                # Remove the X and add recycle (failures are logged by _apply_reactions)
+                await self._apply_reactions(original_message, add=(EMOJI_REACTIVATED,), remove=(EMOJI_FAIL,))
+            else:
+                # The reaction worker logs whether the reaction was actually added
+                await self.safe_add_reaction(original_message, cmd.emoji)
+                self.logger.info(f"Queued reaction on original signal message {message_id} for action: {action_taken}")
 
         except Exception as e:
             # Don't fail the whole operation if reaction fails
-            self.logger.error(f"Error adding reaction to original signal: {e}", exc_info=True)
+            self.logger.error("Error adding reaction to original signal: %s", e)
+
+    def _remember_non_alert(self, ref_id: int):
+        """Record a replied-to message ID as not an alert, evicting the oldest past the cap"""
+        self._non_alert_refs[ref_id] = None
+        if len(self._non_alert_refs) > NON_ALERT_CACHE_MAX:
+            self._non_alert_refs.popitem(last=False)
+
+    async def _get_referenced_message(self, message: discord.Message) -> discord.Message:
+        """
+        Resolve the message a reply points to, preferring the gateway cache
+        and the reply payload over a fetch
+
+        Args:
+            message: The reply message
+
+        Returns:
+            The referenced message
+        """
+        cached = message.reference.cached_message
+        if cached is not None:
+            return cached
+        # Replies usually carry the referenced message in the gateway payload
+        resolved = message.reference.resolved
+        if isinstance(resolved, discord.Message):
+            return resolved
+        fetched = await message.channel.fetch_message(message.reference.message_id)
+        # Keep it on the reference so the other reply handler reuses this fetch
+        message.reference.resolved = fetched
+        return fetched
+
+    async def _apply_management_command(self, cmd: _Command, signal_id: int, signal: dict,
+                                        reason: str, auto_hit_first_limit: bool = False) -> Tuple[bool, dict]:
+        """
+        Run a profit / hit / breakeven / stop loss reply command
+
+        Shared by the alert-reply and signal-reply handlers; cancel and
+        reactivate work differently in each and stay in the callers.
+
+        Args:
+            cmd: Command from _COMMAND_TABLE (one of _STATUS_COMMANDS)
+            signal_id: Signal ID
+            signal: Signal row the reply refers to
+            reason: Reason recorded with the status change
+            auto_hit_first_limit: On profit, mark the first pending limit hit if none
+                has been (alert replies only - an approaching alert went straight to profit)
+
+        Returns:
+            (success, signal) - signal is re-read if the command changed its limits
+        """
+        if cmd is _PROFIT:
+            # If signal has no limits hit yet (approaching→profit), mark limit 1 as hit first
+            if auto_hit_first_limit and not signal.get('hit_limits'):
+                pending = sorted(
+                    signal.get('pending_limits') or [],
+                    key=lambda l: l.get('sequence_number', 999)
+                )
+                if pending:
+                    try:
+                        await db.mark_limit_hit(pending[0]['id'], pending[0]['price_level'])
+                        # Refresh signal so result_pips calc and embed see the hit limit
+                        signal = await self.signal_db.get_signal_with_limits(signal_id) or signal
+                    except Exception as _he:
+                        logger.warning("Could not auto-hit limit for signal %s on profit reply: %s", signal_id, _he)
+            # Use TP threshold from config as the recorded result
+            profit_result_pips = self.tp_config.get_tp_value(signal['instrument'], scalp=signal.get('scalp', False))
+            async with command_timeout(_CMD_TIMEOUT):
+                success = await self.status_batcher.set_status(
+                    signal_id, cmd.status, reason, result_pips=profit_result_pips,
+                )
+            return success, signal
+
+        if cmd is _HIT:
+            was_cancelled = signal.get('status') == 'cancelled'
+            async with command_timeout(_CMD_TIMEOUT):
+                transitioned = await self.signal_db.manually_set_signal_to_hit(signal_id, reason)
+            if not transitioned:
+                # Already HIT — nothing to do
+                return False, signal
+            # Populate TP cache immediately so auto-TP starts on the next tick
+            if hasattr(self.bot, 'monitor') and self.bot.monitor:
+                monitor = self.bot.monitor
+                await monitor.tp_monitor.refresh_hit_limits(signal_id)
+                if signal_id in monitor.active_signals:
+                    monitor.active_signals[signal_id]['status'] = 'hit'
+                elif was_cancelled:
+                    # Signal was cancelled and not in monitor — re-add it now
+                    # so price tracking and auto-TP resume immediately
+                    reloaded = await self.signal_db.get_signal_with_limits(signal_id)
+                    if reloaded:
+                        reloaded_for_monitor = dict(reloaded)
+                        reloaded_for_monitor['signal_id'] = signal_id
+                        reloaded_for_monitor['status'] = 'hit'
+                        monitor.active_signals[signal_id] = reloaded_for_monitor
+                        symbol = signal.get('instrument')
+                        if symbol:
+                            monitor.symbol_to_signals.setdefault(symbol, [])
+                            if signal_id not in monitor.symbol_to_signals[symbol]:
+                                monitor.symbol_to_signals[symbol].append(signal_id)
+                            await monitor.stream_manager.bulk_subscribe([symbol])
+            return True, signal
+
+        if cmd is _STOP_LOSS:
+            # Hit limits, P&L at the stop price and the status write share one transaction
+            async with command_timeout(_CMD_TIMEOUT):
+                success = await self.signal_db.close_signal_as_stoploss(
+                    signal_id, reason, self.tp_config.calculate_pnl_batch
+                )
+            return success, signal
+
+        async with command_timeout(_CMD_TIMEOUT):
+            success = await self.status_batcher.set_status(signal_id, cmd.status, reason)
+        return success, signal
+
+    async def _reactivate_from_alert(self, signal_id: int, signal: dict) -> Tuple[bool, Optional[str]]:
+        """
+        Reactivate a cancelled signal from an alert reply
+
+        Uses the parse stored at save time; older rows without one fall back
+        to fetching and re-parsing the original signal message.
+
+        Args:
+            signal_id: Signal ID
+            signal: Signal row from get_signal_with_limits
+
+        Returns:
+            (success, error reply to send or None)
+        """
+        # Only allow if signal was cancelled
+        if signal['status'] != 'cancelled':
+            return False, f"❌ Signal is not cancelled (current status: {signal['status']})"
+
+        parsed = deserialize_parsed_signal(signal.get('parsed_payload'))
+        if not parsed:
+            if not (signal.get('message_id') and signal.get('channel_id')):
+                return False, None
+            if signal_id in self._missing_originals:
+                return False, "❌ Cannot reactivate - original signal message not found."
+            try:
+                original_channel_id = int(signal['channel_id'])
+                original_channel = self.bot.get_channel(original_channel_id)
+                if original_channel is None:
+                    original_channel = await self.bot.fetch_channel(original_channel_id)
+                original_message = await original_channel.fetch_message(int(signal['message_id']))
+            except Exception as e:
+                logger.error(f"Error getting original message: {e}")
+                if isinstance(e, discord.NotFound):
+                    # Deleted messages don't come back; skip the fetch next time
+                    self._missing_originals.add(signal_id)
+                return False, "❌ Cannot reactivate - original signal message not found."
+
+            parsed = parse_signal(original_message.content, self.get_channel_name(original_channel_id))
+            if not parsed:
+                return False, "❌ Cannot reactivate - failed to parse original signal."
+
+        async with command_timeout(_CMD_TIMEOUT):
+            success = await self.signal_db.reactivate_cancelled_signal(signal_id, parsed)
+        if success:
+            # Mark NM-immune so the monitor can't auto-cancel again
+            if (hasattr(self.bot, 'monitor') and self.bot.monitor and
+                    hasattr(self.bot.monitor, 'nm_monitor')):
+                self.bot.monitor.nm_monitor.mark_immune(signal_id)
+        return success, None
 
     async def check_alert_management_reply(self, message: discord.Message):
         """
@@ -164,19 +478,23 @@ class MessageHandler:
         Args:
             message: The message to check
         """
-        logger.debug(f"check_alert_management_reply called for message from {message.author.name}")
+        if self.TRACE:
+            logger.debug("check_alert_management_reply called for message from %s", message.author.name)
 
         if not message.reference:
-            logger.debug("Not a reply, skipping")
+            if self.TRACE:
+                logger.debug("Not a reply, skipping")
             return
 
         if message.author.bot:
-            logger.debug("Author is bot, skipping")
+            if self.TRACE:
+                logger.debug("Author is bot, skipping")
             return
 
         # Check if we have access to the alert system
         if not self.alert_system:
-            logger.debug("Alert system not set on message handler, checking bot.monitor")
+            if self.TRACE:
+                logger.debug("Alert system not set on message handler, checking bot.monitor")
             # The connection should have been made in bot.setup_hook
             # But double-check here as a fallback
             if hasattr(self.bot, 'monitor') and self.bot.monitor and self.bot.monitor.alert_system:
@@ -185,39 +503,58 @@ class MessageHandler:
                     f"Got alert system from bot.monitor, has {len(self.alert_system.alert_messages)} tracked messages")
             else:
                 logger.warning("Alert system not available - monitor may not be initialized")
-                logger.warning(f"bot.monitor exists: {hasattr(self.bot, 'monitor')}")
-                logger.warning(f"bot.monitor value: {self.bot.monitor if hasattr(self.bot, 'monitor') else 'N/A'}")
+                logger.warning("bot.monitor exists: %s", hasattr(self.bot, 'monitor'))
+                logger.warning("bot.monitor value: %s", self.bot.monitor if hasattr(self.bot, 'monitor') else 'N/A')
                 return
 
         try:
-            # Get the referenced message
-            referenced = await message.channel.fetch_message(message.reference.message_id)
-            logger.debug(f"Referenced message ID: {referenced.id}, Author: {referenced.author.name}")
-
-            # Check if this is an alert message
-            signal_id = self.alert_system.get_signal_from_alert(str(referenced.id))
-            logger.debug(f"Signal ID from alert lookup: {signal_id}")
+            # Check if this is an alert message — the lookup only needs the
+            # referenced message ID, so start the DB read before fetching it
+            ref_id = message.reference.message_id
+            signal_id = self.alert_system.get_signal_from_alert(str(ref_id))
+            if self.TRACE:
+                logger.debug("Signal ID from alert lookup: %s", signal_id)
+            if not signal_id and ref_id in self._non_alert_refs:
+                # Already fetched and ruled out - skip the round-trip
+                self._non_alert_refs.move_to_end(ref_id)
+                return
 
             if not signal_id:
-                # Not an alert message, check if it's from the bot (could be untracked alert)
-                if referenced.author.id == self.bot.user.id:
-                    logger.debug("Referenced message is from bot but not tracked as alert")
+                # Not a tracked alert, check if it's from the bot (could be untracked alert)
+                referenced = await self._get_referenced_message(message)
+                if referenced.author.id == self._bot_user_id:
+                    if self.TRACE:
+                        logger.debug("Referenced message is from bot but not tracked as alert")
                     # Check if it looks like an alert by embed title
                     if referenced.embeds:
-                        embed = referenced.embeds[0]
-                        if any(keyword in embed.title.lower() for keyword in ['approaching', 'hit', 'stop loss']):
-                            logger.warning(f"Message looks like alert but isn't tracked: {referenced.id}")
+                        title_low = (referenced.embeds[0].title or "").lower()
+                        if any(keyword in title_low for keyword in _ALERT_TITLE_KEYWORDS):
+                            logger.warning("Message looks like alert but isn't tracked: %s", referenced.id)
                             await message.reply(
                                 "❌ This alert is not tracked. It may have been sent before the bot restarted.")
                             return
                 else:
-                    logger.debug("Referenced message is not from bot, not an alert")
+                    if self.TRACE:
+                        logger.debug("Referenced message is not from bot, not an alert")
+                self._remember_non_alert(ref_id)
                 return
 
+            signal_task = asyncio.create_task(self.signal_db.get_signal_with_limits(signal_id))
+
+            # Get the referenced message
+            try:
+                referenced = await self._get_referenced_message(message)
+            except Exception:
+                signal_task.cancel()
+                raise
+            if self.TRACE:
+                logger.debug("Referenced message ID: %s, Author: %s", referenced.id, referenced.author.name)
+
             logger.info(f"Processing alert management command for signal {signal_id}: '{message.content}'")
 
-            # Parse the command
-            command_parts = message.content.lower().strip().split()
+            # Parse the command (normalize the reply text once)
+            content_norm = _normalize_reply(message.content)
+            command_parts = content_norm.split()
             command = command_parts[0] if command_parts else ""
 
             # Parse optional profit amount (for profit commands)
@@ -225,185 +562,65 @@ class MessageHandler:
             if len(command_parts) > 1 and command in ("profit", "win", "tp", "hit"):
                 try:
                     profit_amount = float(command_parts[1])
-                    logger.debug(f"Parsed profit amount: {profit_amount}")
+                    if self.TRACE:
+                        logger.debug("Parsed profit amount: %s", profit_amount)
                 except (ValueError, IndexError):
-                    logger.debug(f"Could not parse profit amount from: {command_parts[1:]}")
+                    if self.TRACE:
+                        logger.debug("Could not parse profit amount from: %s", command_parts[1:])
 
-            # Get the signal from database
-            signal = await self.signal_db.get_signal_with_limits(signal_id)
+            # Get the signal from database (query started above)
+            signal = await signal_task
             if not signal:
-                logger.warning(f"No signal found with ID {signal_id}")
+                logger.warning("No signal found with ID %s", signal_id)
                 await message.reply("❌ Signal not found.")
                 return
 
-            logger.debug(f"Found signal: {signal['instrument']} {signal['direction']}, status: {signal['status']}")
+            if self.TRACE:
+                logger.debug("Found signal: %s %s, status: %s", signal['instrument'], signal['direction'], signal['status'])
 
             # Note: Anyone can manage signals via alert replies (not just the author)
 
             success = False
             action_taken = None
 
-            # Import asyncio for timeouts
-            import asyncio
-
             # Process different commands with timeout protection
+            cmd = _COMMAND_TABLE.get(command)
             try:
-                if command in ("cancel", "nm", "cancelled"):
-                    logger.debug(f"Processing cancel command for signal {signal_id}")
+                if cmd is _CANCEL:
+                    if self.TRACE:
+                        logger.debug("Processing cancel command for signal %s", signal_id)
                     # Use the signal ID directly since we have it
-                    success = await asyncio.wait_for(
-                        self.signal_db.manually_set_signal_status(
-                            signal_id, 'cancelled', f"Cancelled via alert reply by {message.author.name}"
-                        ),
-                        timeout=5.0
-                    )
-                    action_taken = "cancelled"
-                    logger.debug(f"Cancel result: {success}")
-
-
-                elif command in ("profit", "win", "tp"):
-                    logger.debug(f"Processing profit command for signal {signal_id}")
-                    # If signal has no limits hit yet (approaching→profit), mark limit 1 as hit first
-                    if not signal.get('hit_limits'):
-                        pending = sorted(
-                            signal.get('pending_limits') or [],
-                            key=lambda l: l.get('sequence_number', 999)
+                    async with command_timeout(_CMD_TIMEOUT):
+                        success = await self.status_batcher.set_status(
+                            signal_id, cmd.status, f"Cancelled via alert reply by {message.author.name}"
                         )
-                        if pending:
-                            try:
-                                from database import db as _db
-                                await _db.mark_limit_hit(pending[0]['id'], pending[0]['price_level'])
-                                # Refresh signal so result_pips calc and embed see the hit limit
-                                signal = await self.signal_db.get_signal_with_limits(signal_id) or signal
-                            except Exception as _he:
-                                logger.warning(f"Could not auto-hit limit for signal {signal_id} on profit reply: {_he}")
-                    # Use TP threshold from config as the recorded result
-                    profit_result_pips = self.tp_config.get_tp_value(signal['instrument'], scalp=signal.get('scalp', False))
-                    success = await asyncio.wait_for(
-                        self.signal_db.manually_set_signal_status(
-                            signal_id, 'profit', f"Set via alert reply by {message.author.name}",
-                            result_pips=profit_result_pips,
-                        ),
-                        timeout=5.0
-                    )
-                    action_taken = "marked as PROFIT"
-                elif command in ("hit",):
-                    logger.debug(f"Processing hit command for signal {signal_id}")
-                    was_cancelled = signal.get('status') == 'cancelled'
-                    transitioned = await asyncio.wait_for(
-                        self.signal_db.manually_set_signal_to_hit(
-                            signal_id, f"Set via alert reply by {message.author.name}"
-                        ),
-                        timeout=5.0
-                    )
-                    if transitioned:
-                        # Populate TP cache immediately so auto-TP starts on the next tick
-                        if hasattr(self.bot, 'monitor') and self.bot.monitor:
-                            monitor = self.bot.monitor
-                            await monitor.tp_monitor.refresh_hit_limits(signal_id)
-                            if signal_id in monitor.active_signals:
-                                monitor.active_signals[signal_id]['status'] = 'hit'
-                            elif was_cancelled:
-                                # Signal was cancelled and not in monitor — re-add it now
-                                # so price tracking and auto-TP resume immediately
-                                reloaded = await self.signal_db.get_signal_with_limits(signal_id)
-                                if reloaded:
-                                    reloaded_for_monitor = dict(reloaded)
-                                    reloaded_for_monitor['signal_id'] = signal_id
-                                    reloaded_for_monitor['status'] = 'hit'
-                                    monitor.active_signals[signal_id] = reloaded_for_monitor
-                                    symbol = signal.get('instrument')
-                                    if symbol:
-                                        monitor.symbol_to_signals.setdefault(symbol, [])
-                                        if signal_id not in monitor.symbol_to_signals[symbol]:
-                                            monitor.symbol_to_signals[symbol].append(signal_id)
-                                        await monitor.stream_manager.bulk_subscribe([symbol])
-                        success = True
-                        action_taken = "marked as HIT"
-                    else:
-                        # Already HIT — nothing to do
-                        success = False
-                        action_taken = None
-
-                elif command in ("breakeven", "be"):
-                    logger.debug(f"Processing breakeven command for signal {signal_id}")
-                    success = await asyncio.wait_for(
-                        self.signal_db.manually_set_signal_status(
-                            signal_id, 'breakeven', f"Set via alert reply by {message.author.name}"
-                        ),
-                        timeout=5.0
-                    )
-                    action_taken = "marked as BREAKEVEN"
+                    action_taken = cmd.action
+                    if self.TRACE:
+                        logger.debug("Cancel result: %s", success)
 
-                elif command in ("sl", "stop", "stoploss", "stop loss"):
-                    logger.debug(f"Processing stop loss command for signal {signal_id}")
-                    # Sum P&L of all hit limits at the stop loss price
-                    sl_result_pips = None
-                    try:
-                        hit_limits = await self.signal_db.get_hit_limits_for_signal(signal_id)
-                        stop_price = signal.get('stop_loss')
-                        if hit_limits and stop_price:
-                            combined = 0.0
-                            for lim in hit_limits:
-                                entry = lim.get('hit_price') or lim.get('price_level')
-                                if entry is not None:
-                                    combined += self.tp_config.calculate_pnl(
-                                        signal['instrument'], signal['direction'], entry, stop_price,
-                                        scalp=signal.get('scalp', False)
-                                    )
-                            sl_result_pips = combined
-                    except Exception as e:
-                        logger.warning(f"Could not calculate SL result_pips for signal {signal_id}: {e}")
-                    success = await asyncio.wait_for(
-                        self.signal_db.manually_set_signal_status(
-                            signal_id, 'stop_loss', f"Set via alert reply by {message.author.name}",
-                            result_pips=sl_result_pips,
-                        ),
-                        timeout=5.0
-                    )
-                    action_taken = "marked as STOP LOSS"
 
-                elif command in ("reactivate", "reopen", "active"):
-                    logger.debug(f"Processing reactivate command for signal {signal_id}")
-                    # Only allow if signal was cancelled
-                    if signal['status'] == 'cancelled':
-                        # Try to get the original message to re-parse
-                        if signal.get('message_id') and signal.get('channel_id'):
-                            try:
-                                original_channel = self.bot.get_channel(int(signal['channel_id']))
-                                if original_channel is None:
-                                    original_channel = await self.bot.fetch_channel(int(signal['channel_id']))
-                                original_message = await original_channel.fetch_message(int(signal['message_id']))
-
-                                from core.parser import parse_signal
-                                channel_name = self.get_channel_name(int(signal['channel_id']))
-                                parsed = parse_signal(original_message.content, channel_name)
-
-                                if parsed:
-                                    success = await asyncio.wait_for(
-                                        self.signal_db.reactivate_cancelled_signal(signal_id, parsed),
-                                        timeout=5.0
-                                    )
-                                    if success:
-                                        action_taken = "reactivated"
-                                        # Mark NM-immune so the monitor can't auto-cancel again
-                                        if (hasattr(self.bot, 'monitor') and self.bot.monitor and
-                                                hasattr(self.bot.monitor, 'nm_monitor')):
-                                            self.bot.monitor.nm_monitor.mark_immune(signal_id)
-                                else:
-                                    await message.reply("❌ Cannot reactivate - failed to parse original signal.")
-                                    return
-                            except Exception as e:
-                                logger.error(f"Error getting original message: {e}")
-                                await message.reply("❌ Cannot reactivate - original signal message not found.")
-                                return
-                    else:
-                        await message.reply(f"❌ Signal is not cancelled (current status: {signal['status']})")
+                elif cmd in _STATUS_COMMANDS:
+                    if self.TRACE:
+                        logger.debug("Processing %s command for signal %s", cmd.status, signal_id)
+                    success, signal = await self._apply_management_command(
+                        cmd, signal_id, signal, f"Set via alert reply by {message.author.name}",
+                        auto_hit_first_limit=True
+                    )
+                    action_taken = cmd.action if success else None
+
+                elif cmd is _REACTIVATE:
+                    if self.TRACE:
+                        logger.debug("Processing reactivate command for signal %s", signal_id)
+                    success, error_reply = await self._reactivate_from_alert(signal_id, signal)
+                    if error_reply:
+                        await message.reply(error_reply)
                         return
+                    action_taken = cmd.action if success else None
 
                 else:
                     # Unknown command
-                    logger.debug(f"Unknown command: '{command}'")
+                    if self.TRACE:
+                        logger.debug("Unknown command: '%s'", command)
                     await message.reply(
                         "❓ Unknown command. Valid commands: `cancel`, `profit`, `tp`, `breakeven`, `be`, `sl`, `stop`, `reactivate`\n"
                         "For profit, you can optionally specify pips: `profit 40`"
@@ -422,88 +639,48 @@ class MessageHandler:
             if success and action_taken:
                 logger.info(f"Successfully processed command, sending confirmation")
 
-                # Update reactions on alert message (referenced message)
-                if action_taken == "cancelled":
-                    try:
-                        await referenced.remove_reaction("✅", self.bot.user)
-                    except:
-                        pass  # Reaction might not exist
-                    await referenced.add_reaction("❌")
-                elif action_taken == "marked as HIT":
-                    await referenced.add_reaction("🎯")
-                elif action_taken == "marked as PROFIT":
-                    await referenced.add_reaction("💰")
-                elif action_taken == "marked as BREAKEVEN":
-                    await referenced.add_reaction("➖")
-                elif action_taken == "marked as STOP LOSS":
-                    await referenced.add_reaction("🛑")
-                elif action_taken == "reactivated":
-                    try:
-                        await referenced.remove_reaction("❌", self.bot.user)
-                    except:
-                        pass
-                    await referenced.add_reaction("✅")
-                    await referenced.add_reaction("♻️")
-
-                # ALSO react to the original signal message
-                await self._react_to_original_signal(signal, action_taken)
-
-                # Delete the user's reply message to reduce clutter
-                try:
-                    await message.delete()
-                except Exception:
-                    pass
+                # Update reactions on the alert message, ALSO react to the original
+                # signal message, and delete the user's reply to reduce clutter.
+                # These touch different messages, so run them concurrently; a
+                # failed delete is ignored as before.
+                await asyncio.gather(
+                    self._apply_reactions(referenced, add=cmd.add_emojis, remove=cmd.remove_emojis),
+                    self._react_to_original_signal(signal, action_taken),
+                    message.delete(),
+                    return_exceptions=True,
+                )
 
                 # Update the persistent alert embed and send a ping saying who manually changed it
                 if self.alert_system:
-                    event_map = {
-                        "cancelled": "cancelled",
-                        "marked as PROFIT": "profit",
-                        "marked as HIT": "hit",
-                        "marked as BREAKEVEN": "breakeven",
-                        "marked as STOP LOSS": "stop_loss",
-                        "reactivated": "reactivated",
-                    }
-                    embed_event = event_map.get(action_taken)
-                    if embed_event:
-                        action_emoji_map = {
-                            "profit": "💰",
-                            "hit": "🎯",
-                            "stop_loss": "🛑",
-                            "breakeven": "➖",
-                            "cancelled": "❌",
-                            "reactivated": "♻️",
-                        }
-                        emoji = action_emoji_map.get(embed_event, "✅")
-                        ping_text = (
-                            f"{emoji} **{signal['instrument']}** {signal['direction'].upper()} — "
-                            f"manually {action_taken.lower()} (by {message.author.display_name})"
-                        )
-                        try:
-                            # get_signal_with_limits returns 'id', not 'signal_id' —
-                            # normalise so update_signal_message can find the embed
-                            _signal_for_update = dict(signal)
-                            if 'signal_id' not in _signal_for_update:
-                                _signal_for_update['signal_id'] = _signal_for_update.get('id', signal_id)
-                            if embed_event == "reactivated":
-                                # Rebuild embed with correct live state (approaching/hit) + current price
-                                await self.alert_system.reactivate_embed(
-                                    signal=_signal_for_update,
-                                    ping_text=ping_text,
-                                )
-                            else:
-                                await self.alert_system.update_signal_message(
-                                    signal=_signal_for_update,
-                                    event=embed_event,
-                                    ping_text=ping_text,
-                                )
-                        except Exception as _ue:
-                            logger.warning(f"Could not update signal embed after manual command: {_ue}")
+                    ping_text = (
+                        f"{cmd.emoji} **{signal['instrument']}** {signal['direction'].upper()} — "
+                        f"manually {action_taken.lower()} (by {message.author.display_name})"
+                    )
+                    try:
+                        # get_signal_with_limits returns 'id', not 'signal_id' —
+                        # normalise so update_signal_message can find the embed
+                        _signal_for_update = dict(signal)
+                        if 'signal_id' not in _signal_for_update:
+                            _signal_for_update['signal_id'] = _signal_for_update.get('id', signal_id)
+                        if cmd is _REACTIVATE:
+                            # Rebuild embed with correct live state (approaching/hit) + current price
+                            await self.alert_system.reactivate_embed(
+                                signal=_signal_for_update,
+                                ping_text=ping_text,
+                            )
+                        else:
+                            await self.alert_system.update_signal_message(
+                                signal=_signal_for_update,
+                                event=cmd.event,
+                                ping_text=ping_text,
+                            )
+                    except Exception as _ue:
+                        logger.warning("Could not update signal embed after manual command: %s", _ue)
 
                 logger.info(f"Signal {signal_id} {action_taken} via alert reply by {message.author.name}")
             else:
                 await message.reply(f"❌ Failed to process command.")
-                logger.warning(f"Failed to process command '{command}' for signal {signal_id}")
+                logger.warning("Failed to process command '%s' for signal %s", command, signal_id)
 
         except Exception as e:
             logger.error(f"Error in alert management reply: {e}", exc_info=True)
@@ -519,15 +696,7 @@ class MessageHandler:
             profit_amount: Optional profit amount in pips/points
         """
         try:
-            # Load channel configuration
-            import json
-            import os
-
-            config_path = os.path.join('config', 'channels.json')
-            with open(config_path, 'r') as f:
-                channels_config = json.load(f)
-
-            profit_channel_id = channels_config.get('profit_channel')
+            profit_channel_id = (self.bot.channels_config or {}).get('profit_channel')
             if not profit_channel_id:
                 logger.warning("No profit_channel configured in channels.json")
                 return
@@ -537,56 +706,22 @@ class MessageHandler:
                 logger.error(f"Could not find profit channel with ID {profit_channel_id}")
                 return
 
-            # Create profit embed
-            embed = discord.Embed(
-                title="💰 PROFIT Alert",
-                description=f"Signal #{signal['id']} has been marked as **PROFIT**",
-                color=0x00FF00,  # Green
-                timestamp=discord.utils.utcnow()
-            )
-
-            # Add signal details
-            embed.add_field(name="Symbol", value=signal['instrument'], inline=True)
-            embed.add_field(name="Position", value=signal['direction'].upper(), inline=True)
-
-            # Add profit amount if specified
+            profit_text = None
             if profit_amount:
-                unit = self.get_pip_unit_name(signal['instrument'])
-                embed.add_field(name="Profit", value=f"**{profit_amount:.1f} {unit}**", inline=True)
-            else:
-                embed.add_field(name="Status", value="✅ Profit", inline=True)
-
-            # Add entry price if available
-            if signal.get('entry_price'):
-                embed.add_field(name="Entry", value=f"{signal['entry_price']}", inline=True)
-
-            # Add limits if available
-            if signal.get('limits'):
-                limits_text = []
-                for limit in signal['limits']:
-                    if limit.get('status') == 'hit':
-                        limits_text.append(f"~~{limit['price_level']}~~ ✅")
-                    else:
-                        limits_text.append(str(limit['price_level']))
-                if limits_text:
-                    embed.add_field(name="Limits", value="\n".join(limits_text[:3]), inline=True)  # Show max 3
-
-            # Add stop loss if available
-            if signal.get('stop_loss'):
-                embed.add_field(name="Stop Loss", value=signal['stop_loss'], inline=True)
-
-            # Add metadata
-            embed.set_footer(text=f"Marked by {user.name}")
+                profit_text = f"{profit_amount:.1f} {self.get_pip_unit_name(signal['instrument'])}"
 
-            # Add original message link if available
+            # Original message link if available
+            message_link = None
             if signal.get('message_id') and signal.get('channel_id'):
                 try:
-                    original_channel = self.bot.get_channel(int(signal['channel_id']))
+                    original_channel_id = int(signal['channel_id'])
+                    original_channel = self.bot.get_channel(original_channel_id)
                     if original_channel:
-                        message_link = f"https://discord.com/channels/{original_channel.guild.id}/{signal['channel_id']}/{signal['message_id']}"
-                        embed.add_field(name="Original Signal", value=f"[View Message]({message_link})", inline=False)
+                        message_link = f"https://discord.com/channels/{original_channel.guild.id}/{original_channel_id}/{signal['message_id']}"
                 except Exception as e:
-                    logger.debug(f"Could not create message link: {e}")
+                    logger.debug("Could not create message link: %s", e)
+
+            embed = EmbedFactory.profit_alert(signal, user.name, profit_text, message_link)
 
             # Send the profit alert
             await profit_channel.send(embed=embed)
@@ -642,7 +777,7 @@ class MessageHandler:
             return "points"
 
         except Exception as e:
-            logger.debug(f"Error determining pip unit: {e}")
+            logger.debug("Error determining pip unit: %s", e)
             # Safe default
             return "pips" if 'USD' in instrument_upper else "points"
 
@@ -657,9 +792,23 @@ class MessageHandler:
         if not message.reference or message.author.bot:
             return
 
+        # Signals only live in monitored channels, and a reply shares its target's channel
+        if message.channel.id not in self.bot.monitored_channels:
+            return
+
+        # Long replies can't be commands - skip before resolving the reference
+        if len(message.content) > _MAX_COMMAND_LEN and len(message.content.strip()) > _MAX_COMMAND_LEN:
+            return
+
         try:
+            # Look the signal up by the referenced ID first; most replies aren't
+            # to signals and this saves a possible fetch_message for them
+            signal = await self.lookup_batcher.get_signal_by_message_id(str(message.reference.message_id))
+            if not signal:
+                return
+
             # Get the referenced message
-            referenced = await message.channel.fetch_message(message.reference.message_id)
+            referenced = await self._get_referenced_message(message)
 
             # Check if the referenced message has a ✅ reaction from the bot
             has_bot_reaction = await self.has_bot_success_reaction(referenced)
@@ -667,136 +816,57 @@ class MessageHandler:
             if not has_bot_reaction:
                 return
 
-            # Parse the command
-            command = message.content.lower().strip()
+            # Parse the command (normalize the reply text once)
+            command = _normalize_reply(message.content)
             self.logger.info(f"Processing signal management command: '{command}' for message {referenced.id}")
 
-            # Get the signal from database
-            signal = await self.signal_db.get_signal_by_message_id(str(referenced.id))
-            if not signal:
-                self.logger.warning(f"No signal found for message {referenced.id}")
-                return
-
             # Check if user is authorized (signal author or admin)
-            is_author = message.author.id == referenced.author.id
-            is_admin = message.author.guild_permissions.administrator if hasattr(message.author, 'guild_permissions') else False
+            # Guild messages carry a Member; DMs and webhooks carry a plain User.
+            # guild_permissions folds every role's permissions, so only compute
+            # it when the replier isn't the signal's author
+            is_authorized = (
+                message.author.id == referenced.author.id
+                or (isinstance(message.author, discord.Member)
+                    and message.author.guild_permissions.administrator)
+            )
 
-            if not (is_author or is_admin):
+            if not is_authorized:
                 await message.reply("Only the signal sender or admins can manage this signal.")
                 return
 
             success = False
             action_taken = None
 
-            # Import asyncio for timeouts
-            import asyncio
-
             # Process different commands with timeout protection
+            cmd = _COMMAND_TABLE.get(command)
             try:
-                if command in ("cancel", "nm", "cancelled"):
+                if cmd is _CANCEL:
                     # For cancel, we need to use the cancel_signal_by_message method
-                    success = await asyncio.wait_for(
-                        self.signal_db.cancel_signal_by_message(str(referenced.id)),
-                        timeout=5.0
-                    )
-                    action_taken = "cancelled"
+                    async with command_timeout(_CMD_TIMEOUT):
+                        success = await self.signal_db.cancel_signal_by_message(str(referenced.id))
+                    action_taken = cmd.action
                     self.logger.info(f"Cancel command result: {success}")
 
-                elif command in ("profit", "win", "tp"):
-                    # Use TP threshold from config as the recorded result
-                    profit_result_pips = self.tp_config.get_tp_value(signal['instrument'], scalp=signal.get('scalp', False))
-                    success = await asyncio.wait_for(
-                        self.signal_db.manually_set_signal_status(
-                            signal['id'], 'profit', f"Set by {message.author.name}",
-                            result_pips=profit_result_pips,
-                        ),
-                        timeout=5.0
+                elif cmd in _STATUS_COMMANDS:
+                    reason = (f"Set via signal reply by {message.author.name}" if cmd is _HIT
+                              else f"Set by {message.author.name}")
+                    success, signal = await self._apply_management_command(
+                        cmd, signal['id'], signal, reason
                     )
-                    action_taken = "marked as PROFIT"
-
-                elif command in ("breakeven", "be"):
-                    success = await asyncio.wait_for(
-                        self.signal_db.manually_set_signal_status(
-                            signal['id'], 'breakeven', f"Set by {message.author.name}"
-                        ),
-                        timeout=5.0
-                    )
-                    action_taken = "marked as BREAKEVEN"
+                    action_taken = cmd.action if success else None
 
-                elif command in ("sl", "stop", "stoploss", "stop loss"):
-                    # Sum P&L of all hit limits at the stop loss price
-                    sl_result_pips = None
-                    try:
-                        hit_limits = await self.signal_db.get_hit_limits_for_signal(signal['id'])
-                        stop_price = signal.get('stop_loss')
-                        if hit_limits and stop_price:
-                            combined = 0.0
-                            for lim in hit_limits:
-                                entry = lim.get('hit_price') or lim.get('price_level')
-                                if entry is not None:
-                                    combined += self.tp_config.calculate_pnl(
-                                        signal['instrument'], signal['direction'], entry, stop_price,
-                                        scalp=signal.get('scalp', False)
-                                    )
-                            sl_result_pips = combined
-                    except Exception as e:
-                        logger.warning(f"Could not calculate SL result_pips for signal {signal['id']}: {e}")
-                    success = await asyncio.wait_for(
-                        self.signal_db.manually_set_signal_status(
-                            signal['id'], 'stop_loss', f"Set by {message.author.name}",
-                            result_pips=sl_result_pips,
-                        ),
-                        timeout=5.0
-                    )
-                    action_taken = "marked as STOP LOSS"
-
-                elif command in ("hit",):
-                    self.logger.debug(f"Processing hit command for signal {signal['id']} via signal reply")
-                    was_cancelled = signal.get('status') == 'cancelled'
-                    transitioned = await asyncio.wait_for(
-                        self.signal_db.manually_set_signal_to_hit(
-                            signal['id'], f"Set via signal reply by {message.author.name}"
-                        ),
-                        timeout=5.0
-                    )
-                    if transitioned:
-                        if hasattr(self.bot, 'monitor') and self.bot.monitor:
-                            monitor = self.bot.monitor
-                            await monitor.tp_monitor.refresh_hit_limits(signal['id'])
-                            if signal['id'] in monitor.active_signals:
-                                monitor.active_signals[signal['id']]['status'] = 'hit'
-                            elif was_cancelled:
-                                reloaded = await self.signal_db.get_signal_with_limits(signal['id'])
-                                if reloaded:
-                                    reloaded_for_monitor = dict(reloaded)
-                                    reloaded_for_monitor['signal_id'] = signal['id']
-                                    reloaded_for_monitor['status'] = 'hit'
-                                    monitor.active_signals[signal['id']] = reloaded_for_monitor
-                                    sym = signal.get('instrument')
-                                    if sym:
-                                        monitor.symbol_to_signals.setdefault(sym, [])
-                                        if signal['id'] not in monitor.symbol_to_signals[sym]:
-                                            monitor.symbol_to_signals[sym].append(signal['id'])
-                                        await monitor.stream_manager.bulk_subscribe([sym])
-                        success = True
-                        action_taken = "marked as HIT"
-                    else:
-                        success = False
-                        action_taken = None
-
-                elif command in ("reactivate", "reopen", "active"):
+                elif cmd is _REACTIVATE:
                     # Only allow if signal was cancelled
                     if signal['status'] == 'cancelled':
-                        # Need to re-parse to get the signal data
-                        from core.parser import parse_signal
-                        channel_name = self.get_channel_name(referenced.channel.id)
-                        parsed = parse_signal(referenced.content, channel_name)
+                        # Use the parse stored at save time, re-parsing only for older rows
+                        parsed = deserialize_parsed_signal(signal.get('parsed_payload'))
+                        if not parsed:
+                            channel_name = self.get_channel_name(referenced.channel.id)
+                            parsed = parse_signal(referenced.content, channel_name)
                         if parsed:
-                            success = await asyncio.wait_for(
-                                self.signal_db.reactivate_cancelled_signal(signal['id'], parsed),
-                                timeout=5.0
-                            )
-                            action_taken = "reactivated"
+                            async with command_timeout(_CMD_TIMEOUT):
+                                success = await self.signal_db.reactivate_cancelled_signal(signal['id'], parsed)
+                            action_taken = cmd.action
 
             except asyncio.TimeoutError:
                 self.logger.error(f"Operation timed out for command: {command}")
@@ -808,14 +878,16 @@ class MessageHandler:
                 return
 
             if success and action_taken:
-                # Update reactions on original message
-                if action_taken == "cancelled":
-                    try:
-                        await referenced.remove_reaction("✅", self.bot.user)
-                    except:
-                        pass  # Reaction might not exist
-                    await referenced.add_reaction("❌")
+                # Update reactions on the original message and delete the user's
+                # reply to reduce clutter; independent requests, so run them
+                # together (a failed delete is ignored as before)
+                await asyncio.gather(
+                    self._apply_reactions(referenced, add=cmd.add_emojis, remove=cmd.remove_emojis),
+                    message.delete(),
+                    return_exceptions=True,
+                )
 
+                if cmd is _CANCEL:
                     _sig_id_for_check = signal.get('signal_id') or signal.get('id')
                     has_alert_embed = (
                         self.alert_system and
@@ -832,7 +904,7 @@ class MessageHandler:
                                 f"(signal {_sig_id_for_check} cancelled with no alert embed)"
                             )
                         except Exception as _de:
-                            logger.warning(f"Could not delete original signal message {referenced.id}: {_de}")
+                            logger.warning("Could not delete original signal message %s: %s", referenced.id, _de)
 
                         # Send cancellation embed directly to finished-signals channel.
                         if self.alert_system:
@@ -859,7 +931,8 @@ class MessageHandler:
                                                 _embed_limits = _full.get('limits') or _embed_limits
                                     except Exception as _lfe:
                                         self.logger.warning(
-                                            f"Could not fetch limits for cancelled embed (signal {_sig_id_for_check}): {_lfe}"
+                                            "Could not fetch limits for cancelled embed (signal %s): %s",
+                                            _sig_id_for_check, _lfe
                                         )
 
                                     cancel_embed = _build_signal_embed(
@@ -887,78 +960,38 @@ class MessageHandler:
                                     )
                             except Exception as _fe:
                                 logger.warning(
-                                    f"Could not send cancellation embed to finished-signals "
-                                    f"for signal {_sig_id_for_check}: {_fe}"
+                                    "Could not send cancellation embed to finished-signals "
+                                    "for signal %s: %s", _sig_id_for_check, _fe
                                 )
-                elif action_taken == "marked as HIT":
-                    await referenced.add_reaction("🎯")
-                elif action_taken == "marked as PROFIT":
-                    await referenced.add_reaction("💰")
-                elif action_taken == "marked as BREAKEVEN":
-                    await referenced.add_reaction("➖")
-                elif action_taken == "marked as STOP LOSS":
-                    await referenced.add_reaction("🛑")
-                elif action_taken == "reactivated":
-                    try:
-                        await referenced.remove_reaction("❌", self.bot.user)
-                    except:
-                        pass
-                    await referenced.add_reaction("✅")
-                    await referenced.add_reaction("♻️")
-
-                # Delete the user's reply message to reduce clutter
-                try:
-                    await message.delete()
-                except Exception:
-                    pass
 
                 # Update the persistent alert embed and send a ping saying who manually changed it
                 if self.alert_system:
                     _sig_id = signal.get('signal_id') or signal.get('id')
                     _signal_for_update = dict(signal)
                     _signal_for_update['signal_id'] = _sig_id
-                    event_map = {
-                        "cancelled": "cancelled",
-                        "marked as PROFIT": "profit",
-                        "marked as HIT": "hit",
-                        "marked as BREAKEVEN": "breakeven",
-                        "marked as STOP LOSS": "stop_loss",
-                        "reactivated": "reactivated",
-                    }
-                    embed_event = event_map.get(action_taken)
-                    if embed_event:
-                        action_emoji_map = {
-                            "profit": "💰",
-                            "hit": "🎯",
-                            "stop_loss": "🛑",
-                            "breakeven": "➖",
-                            "cancelled": "❌",
-                            "reactivated": "♻️",
-                        }
-                        emoji = action_emoji_map.get(embed_event, "✅")
-                        ping_text = (
-                            f"{emoji} **{signal['instrument']}** {signal['direction'].upper()} — "
-                            f"manually {action_taken.lower()} (by {message.author.display_name})"
-                        )
-                        try:
-                            if embed_event == "reactivated":
-                                # Rebuild embed with correct live state (approaching/hit) + current price
-                                await self.alert_system.reactivate_embed(
-                                    signal=_signal_for_update,
-                                    ping_text=ping_text,
-                                )
-                            else:
-                                await self.alert_system.update_signal_message(
-                                    signal=_signal_for_update,
-                                    event=embed_event,
-                                    ping_text=ping_text,
-                                )
-                        except Exception as _ue:
-                            logger.warning(f"Could not update signal embed after manual command: {_ue}")
+                    ping_text = (
+                        f"{cmd.emoji} **{signal['instrument']}** {signal['direction'].upper()} — "
+                        f"manually {action_taken.lower()} (by {message.author.display_name})"
+                    )
+                    try:
+                        if cmd is _REACTIVATE:
+                            # Rebuild embed with correct live state (approaching/hit) + current price
+                            await self.alert_system.reactivate_embed(
+                                signal=_signal_for_update,
+                                ping_text=ping_text,
+                            )
+                        else:
+                            await self.alert_system.update_signal_message(
+                                signal=_signal_for_update,
+                                event=cmd.event,
+                                ping_text=ping_text,
+                            )
+                    except Exception as _ue:
+                        logger.warning("Could not update signal embed after manual command: %s", _ue)
 
                 self.logger.info(f"Signal {signal['id']} {action_taken} by {message.author.name}")
             else:
-                self.logger.warning(f"Failed to process command '{command}' for signal {signal['id']}")
+                self.logger.warning("Failed to process command '%s' for signal %s", command, signal['id'])
 
         except Exception as e:
             self.logger.error(f"Error in signal management reply: {e}", exc_info=True)
@@ -966,14 +999,13 @@ class MessageHandler:
     async def process_signal(self, message: discord.Message):
         """Process a potential trading signal with enhanced parsing"""
         try:
-            from core.parser import parse_signal, RejectedSignal
             channel_name = self.get_channel_name(message.channel.id)
             parsed = parse_signal(message.content, channel_name)
 
             if isinstance(parsed, RejectedSignal):
                 # Signal looks valid but is malformed (e.g. out-of-order limits = typo).
                 # React ❌ so the user knows to fix and re-edit the message.
-                await self.safe_add_reaction(message, "❌")
+                await self.safe_add_reaction(message, EMOJI_FAIL)
                 self.logger.info(
                     f"Signal rejected as malformed (likely typo) in message {message.id}: "
                     f"{parsed.reason}"
@@ -981,75 +1013,164 @@ class MessageHandler:
                 return
 
             if parsed:
-                success, signal_id = await self.signal_db.save_signal(
-                    parsed,
-                    str(message.id),
-                    str(message.channel.id)
-                )
+                message_id = str(message.id)
+                existing = None
+                if message_id in self._known_message_ids:
+                    # Already saved (e.g. redelivered after a restart) - skip the insert attempt
+                    existing = await self.signal_db.get_signal_by_message_id(message_id)
+                    if existing is None:
+                        # Row was removed since; treat as a new signal
+                        del self._known_message_ids[message_id]
+
+                if existing is None:
+                    success, signal_id = await self.signal_db.save_signal(
+                        parsed,
+                        message_id,
+                        str(message.channel.id)
+                    )
+                else:
+                    success = False
 
                 if success:
-                    await self.safe_add_reaction(message, "✅")
+                    self._remember_message_id(message_id)
+                    await self.safe_add_reaction(message, EMOJI_OK)
                     self.logger.info(f"Signal #{signal_id} processed: {parsed.instrument} {parsed.direction}")
                 else:
-                    existing = await self.signal_db.get_signal_by_message_id(str(message.id))
+                    if existing is None:
+                        existing = await self.signal_db.get_signal_by_message_id(message_id)
+                        if existing:
+                            self._remember_message_id(message_id)
                     if existing and existing['status'] != 'cancelled':
-                        await self.safe_add_reaction(message, "⚠️")
+                        await self.safe_add_reaction(message, EMOJI_WARN)
                     else:
-                        await self.safe_add_reaction(message, "♻️")
-            else:
-                if self.looks_like_signal(message.content):
-                    await self.safe_add_reaction(message, "⚠️")
-                    self.logger.debug(f"Failed to parse apparent signal from message {message.id}")
+                        await self.safe_add_reaction(message, EMOJI_REACTIVATED)
+            elif isinstance(parsed, UnparsedSignal):
+                # Passed the parser's pre-validation but nothing could be extracted
+                await self.safe_add_reaction(message, EMOJI_WARN)
+                self.logger.debug("Failed to parse apparent signal from message %s", message.id)
 
         except Exception as e:
             # Use repr() to safely convert any problematic characters
             self.logger.error(f"Error processing signal: {repr(str(e))}", exc_info=True)
-            await self.safe_add_reaction(message, "⚠️")
+            await self.safe_add_reaction(message, EMOJI_WARN)
 
-    async def safe_add_reaction(self, message: discord.Message, emoji: str):
-        """Safely add a reaction to a message, handling common Discord API errors"""
-        try:
-            await message.add_reaction(emoji)
-        except discord.NotFound:
-            # Message was deleted or we lost access
-            self.logger.warning(f"Could not add reaction to message {message.id} - message not found")
-        except discord.Forbidden:
-            # Lost permissions to add reactions
-            self.logger.warning(f"Could not add reaction to message {message.id} - missing permissions")
-        except discord.HTTPException as e:
-            # Other Discord API errors
-            self.logger.warning(f"Could not add reaction to message {message.id} - HTTP error: {repr(str(e))}")
-        except Exception as e:
-            # Catch-all for any other errors
-            self.logger.error(f"Unexpected error adding reaction: {repr(str(e))}", exc_info=False)
+    async def safe_add_reaction(self, message: discord.Message, emoji: discord.PartialEmoji):
+        """
+        Queue a reaction to be added to a message
+
+        Returns immediately; a single background worker adds queued reactions
+        in order and handles Discord API errors, so signal processing never
+        waits on reaction I/O.
+        """
+        if self._reaction_task is None or self._reaction_task.done():
+            self._reaction_queue = asyncio.Queue()
+            self._reaction_task = asyncio.create_task(self._reaction_worker(), name="reaction_worker")
+        self._reaction_queue.put_nowait((message, emoji))
+
+    async def _reaction_worker(self):
+        """Background task: add queued reactions one at a time"""
+        # Rate limits (429) are waited out and retried by discord.py's HTTP client
+        while True:
+            message, emoji = await self._reaction_queue.get()
+            try:
+                await message.add_reaction(emoji)
+                self.logger.debug("Added reaction %s to message %s", emoji, message.id)
+            except discord.NotFound:
+                # Message was deleted or we lost access
+                self.logger.warning("Could not add reaction to message %s - message not found", message.id)
+            except discord.Forbidden:
+                # Lost permissions to add reactions
+                self.logger.warning("Could not add reaction to message %s - missing permissions", message.id)
+            except discord.HTTPException as e:
+                # Other Discord API errors
+                self.logger.warning("Could not add reaction to message %s - HTTP error: %r", message.id, str(e))
+            except Exception as e:
+                # Catch-all for any other errors
+                self.logger.error("Unexpected error adding reaction: %r", str(e))
+
+    async def stop(self):
+        """Stop background workers (call on bot shutdown)"""
+        if self._reaction_task:
+            self._reaction_task.cancel()
+            try:
+                await self._reaction_task
+            except asyncio.CancelledError:
+                pass
+            self._reaction_task = None
+
+        await self.status_batcher.stop()
+        await self.lookup_batcher.stop()
+
+    async def _apply_reactions(self, message: discord.Message, add=(), remove=()):
+        """
+        Add and remove the bot's reactions on a message concurrently
+
+        Each reaction is an independent request, so they are fired together
+        rather than one round-trip at a time. Failures are logged, not raised.
+
+        Args:
+            message: Message to update
+            add: Emojis to add
+            remove: Emojis (the bot's own) to remove
+        """
+        bot_user = self._bot_user
+        ops = [message.remove_reaction(emoji, bot_user) for emoji in remove]
+        ops.extend(message.add_reaction(emoji) for emoji in add)
+        results = await asyncio.gather(*ops, return_exceptions=True)
+        for result in results:
+            if isinstance(result, Exception):
+                self.logger.warning(
+                    "Could not update reaction on message %s: %r", message.id, str(result)
+                )
+
+    async def _replace_reactions(self, message: discord.Message, emojis):
+        """
+        Clear a message's reactions and add the bot's own `emojis`
+
+        Skips every API call when the message already carries exactly those
+        reactions from the bot alone (e.g. re-editing a signal that was
+        already marked as edited).
+
+        Args:
+            message: Message to update
+            emojis: Emojis the message should end up with
+        """
+        reactions = message.reactions
+        if (reactions and all(r.me and r.count == 1 for r in reactions)
+                and {str(r.emoji) for r in reactions} == {e.name for e in emojis}):
+            return
+        if reactions:
+            await message.clear_reactions()
+        await self._apply_reactions(message, add=emojis)
 
     async def handle_message_edit(self, before: discord.Message, after: discord.Message):
         """Handle message edits with signal reparsing"""
         if after.author.bot:
             return
 
-        # CHECK: Only process edits in allowed channels
-        if not self.is_allowed_channel(after.channel.id):
+        # CHECK: Only process edits in allowed, monitored channels
+        if after.channel.id not in self._active_channel_ids:
             return
 
-        if after.channel.id not in self.bot.monitored_channels:
+        # Embed unfurls, pins etc. also fire edit events — nothing to re-parse
+        if before.content == after.content:
             return
 
         self.logger.info(f"Message edited in monitored channel: {after.channel.name}")
 
         existing = await self.signal_db.get_signal_by_message_id(str(after.id))
         if not existing:
-            await after.clear_reactions()
+            # after.reactions is gateway-cached; skip the API call when empty
+            if after.reactions:
+                await after.clear_reactions()
             await self.process_signal(after)
             return
 
-        from core.parser import parse_signal, RejectedSignal
         channel_name = self.get_channel_name(after.channel.id)
         parsed = parse_signal(after.content, channel_name)
 
         if isinstance(parsed, RejectedSignal):
-            await after.clear_reactions()
-            await after.add_reaction("❌")
+            await self._replace_reactions(after, (EMOJI_FAIL,))
             self.logger.info(
                 f"Signal edit rejected as malformed (likely typo): {after.id}: {parsed.reason}"
             )
@@ -1058,11 +1179,7 @@ class MessageHandler:
         if parsed:
             # If the signal was cancelled, reactivate it with the updated content
             if existing['status'] == 'cancelled':
-                from database.signal_operations.lifecycle import LifecycleManager
-                lifecycle = LifecycleManager(self.signal_db.db)
-                reactivated = await lifecycle.reactivate_cancelled_signal(
-                    existing['id'], parsed, self.signal_db.db
-                )
+                reactivated = await self.signal_db.reactivate_cancelled_signal(existing['id'], parsed)
                 if reactivated:
                     # Also update the signal fields with the newly parsed content
                     await self.signal_db.update_signal_from_edit(str(after.id), parsed)
@@ -1073,9 +1190,7 @@ class MessageHandler:
                         if nm:
                             nm.mark_immune(existing['id'])
 
-                    await after.clear_reactions()
-                    await after.add_reaction("✅")
-                    await after.add_reaction("♻️")
+                    await self._replace_reactions(after, (EMOJI_OK, EMOJI_REACTIVATED))
                     self.logger.info(f"Cancelled signal reactivated after edit: {after.id}")
 
                     if self.alert_system:
@@ -1095,18 +1210,16 @@ class MessageHandler:
                                     ping_text=ping_text,
                                 )
                         except Exception as _ue:
-                            self.logger.warning(f"Could not update embed after reactivation via edit: {_ue}")
+                            self.logger.warning("Could not update embed after reactivation via edit: %s", _ue)
                 else:
-                    await after.add_reaction("❌")
-                    self.logger.warning(f"Failed to reactivate cancelled signal on edit: {after.id}")
+                    await after.add_reaction(EMOJI_FAIL)
+                    self.logger.warning("Failed to reactivate cancelled signal on edit: %s", after.id)
                 return
 
             success = await self.signal_db.update_signal_from_edit(str(after.id), parsed)
 
             if success:
-                await after.clear_reactions()
-                await after.add_reaction("✅")
-                await after.add_reaction("📝")
+                await self._replace_reactions(after, (EMOJI_OK, EMOJI_EDITED))
                 self.logger.info(f"Signal updated after edit: {after.id}")
 
                 # Update the persistent embed and send an alert ping
@@ -1127,23 +1240,19 @@ class MessageHandler:
                                 ping_text=ping_text,
                             )
                     except Exception as _ue:
-                        self.logger.warning(f"Could not update embed after signal edit: {_ue}")
+                        self.logger.warning("Could not update embed after signal edit: %s", _ue)
             else:
                 if existing['status'] in ['profit', 'breakeven', 'stop_loss']:
-                    await after.add_reaction("🔒")
+                    await after.add_reaction(EMOJI_LOCKED)
                     self.logger.info(f"Cannot update signal in final status: {existing['status']}")
         else:
-            await after.clear_reactions()
-            await after.add_reaction("❌")
+            await self._replace_reactions(after, (EMOJI_FAIL,))
             self.logger.info(f"Signal parse failed after edit: {after.id}")
 
     async def handle_message_delete(self, payload: discord.RawMessageDeleteEvent):
         """Handle message deletions with signal cancellation"""
-        # CHECK: Only process deletions in allowed channels
-        if not self.is_allowed_channel(payload.channel_id):
-            return
-
-        if payload.channel_id not in self.bot.monitored_channels:
+        # CHECK: Only process deletions in allowed, monitored channels
+        if payload.channel_id not in self._active_channel_ids:
             return
 
         self.logger.info(f"Message deleted in monitored channel: {payload.message_id}")
@@ -1162,28 +1271,19 @@ class MessageHandler:
                         if sig_id:
                             await self.alert_system.update_embed_for_signal_id(sig_id, 'cancelled')
                 except Exception as _ue:
-                    self.logger.warning(f"Could not update embed after message delete cancel: {_ue}")
-
-    def looks_like_signal(self, text: str) -> bool:
-        """Check if text appears to be a trading signal"""
-        text = re.sub(r"<@&\d+>.*", "", text).strip().lower()
-        has_numbers = bool(re.search(r'\d+\.?\d*', text))
-        keywords = ['stop', 'sl', 'long', 'short', 'buy', 'sell', 'entry']
-        has_keywords = any(word in text for word in keywords)
-        return has_numbers and has_keywords
+                    self.logger.warning("Could not update embed after message delete cancel: %s", _ue)
 
     async def has_bot_success_reaction(self, message: discord.Message) -> bool:
         """Check if message has a ✅ reaction from the bot"""
+        # Reaction.me comes from the message payload, so no need to page
+        # through reaction.users() over HTTP. Unicode reactions are plain str,
+        # so compare directly instead of stringifying every emoji
+        check = EMOJI_OK.name
         for reaction in message.reactions:
-            if str(reaction.emoji) == "✅":
-                async for user in reaction.users():
-                    if user.id == self.bot.user.id:
-                        return True
+            if reaction.emoji == check:
+                return reaction.me
         return False
 
     def get_channel_name(self, channel_id: int) -> Optional[str]:
         """Get channel name from configuration"""
-        for name, ch_id in self.bot.channels_config.get("monitored_channels", {}).items():
-            if int(ch_id) == channel_id:
-                return name
-        return None
\ No newline at end of file
+        return self._channel_name_by_id.get(channel_id)
\ No newline at end of file
@@ -38,9 +38,20 @@ async def main():
 
 
 if __name__ == "__main__":
+    # Faster libuv-based event loop where available (not on Windows)
+    run_kwargs = {}
+    try:
+        import uvloop
+        if sys.version_info >= (3, 12):
+            run_kwargs["loop_factory"] = uvloop.new_event_loop
+        else:
+            uvloop.install()  # deprecated from 3.12 in favour of loop_factory
+    except ImportError:
+        pass
+
     try:
         # Run the bot
-        asyncio.run(main())
+        asyncio.run(main(), **run_kwargs)
     except KeyboardInterrupt:
         logger.info("Bot stopped by user")
     except Exception as e:
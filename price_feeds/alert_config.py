@@ -14,16 +14,54 @@ FEATURES:
 - Config validation and migration
 """
 
+import asyncio
 import json
 import logging
+import os
+import re
 from pathlib import Path
-from typing import Dict, Tuple, Optional, Literal
+from types import MappingProxyType
+from typing import Dict, Mapping, Tuple, Optional, Literal
 from datetime import datetime, timezone
 
+try:
+    import orjson  # Faster parse/serialize; falls back to stdlib json
+except ImportError:
+    orjson = None
+
 logger = logging.getLogger(__name__)
 
 DistanceType = Literal["pips", "dollars", "percentage"]
 
+# Seconds to wait for further edits before writing the config file
+SAVE_DEBOUNCE = 0.25
+
+# Stamped into configs in the current type/value format so loads can skip the format probe
+SCHEMA_VERSION = 2
+
+# Fallback asset-class / pip-size detection (used when SymbolMapper is unavailable).
+# One alternation per category is a single C-level scan instead of a Python
+# loop over substrings
+_CRYPTO_RE = re.compile("BTC|ETH|BNB|XRP|ADA|DOGE|SOL|DOT|USDT")
+_METALS_RE = re.compile("XAU|XAG|GOLD|SILVER")
+_OIL_RE = re.compile("WTI|BRENT|OIL")
+_INDICES_RE = re.compile("SPX|NAS|DOW|DAX|CHINA50|US500|USTEC|US30|US2000|RUSSELL|GER|DE30|DE40|JP225|NIKKEI")
+_FOREX_CURRENCIES = frozenset({"EUR", "USD", "GBP", "JPY", "AUD", "NZD", "CAD", "CHF"})
+
+# Instruments quoted in points (pip size 1.0)
+_PIP_INDICES_RE = re.compile("SPX|NAS|DOW|DAX|US500|USTEC|US30")
+
+# Last-resort approaching distance per asset class, in price units
+_FALLBACK_DISTANCES = MappingProxyType({
+    'forex': 0.0010,  # 10 pips
+    'forex_jpy': 0.20,  # 20 pips
+    'metals': 10.0,  # $10
+    'indices': 50.0,  # 50 points
+    'stocks': 1.0,  # $1
+    'crypto': 100.0,  # $100
+    'oil': 0.5  # $0.50
+})
+
 
 class AlertDistanceConfig:
     """
@@ -48,31 +86,61 @@ class AlertDistanceConfig:
         else:
             self.config_path = Path(config_path)
 
+        # Resolved {type, value, pip_size, distance, price_factor} per uppercased
+        # symbol; cleared whenever the config is saved or reloaded. Entries are
+        # read-only views shared with callers and are replaced wholesale, never mutated
+        self._symbol_config_cache: Dict[str, Mapping] = {}
+        # Asset class per uppercased symbol (independent of the distance config)
+        self._asset_class_cache: Dict[str, str] = {}
+
+        # Pending debounced write (see save_soon)
+        self._dirty = False
+        self._save_handle: Optional[asyncio.TimerHandle] = None
+
         self.config = self._load_config()
         self._validate_config()
 
-        # Import SymbolMapper for asset class detection
-        try:
-            from price_feeds.symbol_mapper import SymbolMapper
-            mapper_config = self.config_path.parent / 'symbol_mappings.json'
-            self.mapper = SymbolMapper(str(mapper_config))
-        except Exception as e:
-            logger.warning(f"Could not initialize SymbolMapper: {e}, using fallback detection")
-            self.mapper = None
+        # SymbolMapper for asset class detection, created on first use (see mapper)
+        self._mapper = None
+        self._mapper_loaded = False
+
+        self._prebuild_overrides()
 
         logger.info("AlertDistanceConfig initialized (Phase 2 - Fixed Migration)")
 
+    @property
+    def mapper(self):
+        """SymbolMapper for asset class detection, or None to use fallback detection"""
+        # Only default-based lookups classify symbols, so defer importing the
+        # mapper and reading symbol_mappings.json until one actually happens
+        if not self._mapper_loaded:
+            self._mapper_loaded = True
+            try:
+                from price_feeds.symbol_mapper import get_shared_mapper
+                mapper_config = self.config_path.parent / 'symbol_mappings.json'
+                self._mapper = get_shared_mapper(str(mapper_config))
+            except Exception as e:
+                logger.warning(f"Could not initialize SymbolMapper: {e}, using fallback detection")
+                self._mapper = None
+        return self._mapper
+
     def _load_config(self) -> Dict:
         """Load configuration from JSON file"""
         try:
-            with open(self.config_path, 'r') as f:
-                config = json.load(f)
-
-            # Check if migration needed (old format)
-            if 'defaults' not in config or not self._is_new_format(config):
-                logger.warning("Old config format detected, migrating...")
-                config = self._migrate_old_config(config)
-                self._save_config(config)
+            raw = self.config_path.read_bytes()
+            # orjson.JSONDecodeError subclasses json.JSONDecodeError, so the handler below covers both
+            config = orjson.loads(raw) if orjson else json.loads(raw)
+
+            # Check if migration needed (old format). Files written before the
+            # version stamp existed still go through the structural probe
+            if config.get('schema_version') != SCHEMA_VERSION:
+                if 'defaults' not in config or not self._is_new_format(config):
+                    logger.warning("Old config format detected, migrating...")
+                    config = self._migrate_old_config(config)
+                    self._save_config(config)
+                else:
+                    # Persisted with the next save
+                    config['schema_version'] = SCHEMA_VERSION
 
             return config
 
@@ -94,7 +162,16 @@ class AlertDistanceConfig:
         if not isinstance(defaults, dict):
             return False
 
-        # Check if at least one asset class has the new format
+        # Every config written by this class has a forex default, so that one
+        # entry normally decides the format without scanning the rest
+        forex = defaults.get('forex')
+        if isinstance(forex, dict):
+            if 'type' in forex and 'value' in forex:
+                return True
+            if 'approaching_pips' in forex or 'approaching_distance' in forex:
+                return False
+
+        # Otherwise check if at least one asset class has the new format
         for asset_class, settings in defaults.items():
             if isinstance(settings, dict):
                 # New format has 'type' and 'value' keys
@@ -109,6 +186,7 @@ class AlertDistanceConfig:
     def _create_default_config(self) -> Dict:
         """Create default configuration"""
         config = {
+            "schema_version": SCHEMA_VERSION,
             "defaults": {
                 "forex": {
                     "type": "pips",
@@ -234,56 +312,52 @@ class AlertDistanceConfig:
                         new_config["defaults"][asset_class]["value"] = value
                         new_config["defaults"][asset_class]["type"] = distance_type
 
-        # Migrate any existing overrides
-        if 'overrides' in old_config and isinstance(old_config['overrides'], dict):
-            for symbol, settings in old_config['overrides'].items():
-                if isinstance(settings, dict):
-                    # Extract override value and type
-                    if 'approaching_pips' in settings:
-                        new_config['overrides'][symbol] = {
-                            "type": "pips",
-                            "value": settings['approaching_pips'],
-                            "set_by": "Migration",
-                            "set_at": datetime.now(timezone.utc).isoformat()
-                        }
-                    elif 'approaching_distance' in settings:
-                        new_config['overrides'][symbol] = {
-                            "type": "dollars",
-                            "value": settings['approaching_distance'],
-                            "set_by": "Migration",
-                            "set_at": datetime.now(timezone.utc).isoformat()
-                        }
-
-        # Migrate dynamic_overrides if present
-        if 'dynamic_overrides' in old_config and isinstance(old_config['dynamic_overrides'], dict):
-            for symbol, settings in old_config['dynamic_overrides'].items():
-                if isinstance(settings, dict) and symbol not in new_config['overrides']:
-                    # Extract override value and type
-                    if 'approaching_pips' in settings:
-                        new_config['overrides'][symbol] = {
-                            "type": "pips",
-                            "value": settings['approaching_pips'],
-                            "set_by": "Migration",
-                            "set_at": datetime.now(timezone.utc).isoformat()
-                        }
-                    elif 'approaching_distance' in settings:
-                        new_config['overrides'][symbol] = {
-                            "type": "dollars",
-                            "value": settings['approaching_distance'],
-                            "set_by": "Migration",
-                            "set_at": datetime.now(timezone.utc).isoformat()
-                        }
+        # Migrate any existing overrides; dynamic_overrides never replace a static one.
+        # All migrated entries share one timestamp
+        now_iso = datetime.now(timezone.utc).isoformat()
+        for section in ('overrides', 'dynamic_overrides'):
+            if isinstance(old_config.get(section), dict):
+                self._migrate_override_entries(old_config[section], new_config['overrides'], now_iso)
 
         logger.info("Configuration migrated successfully")
         return new_config
 
+    @staticmethod
+    def _migrate_override_entries(entries: Dict, dest: Dict, now_iso: str):
+        """
+        Convert old-format override entries into dest (existing symbols are kept)
+
+        Args:
+            entries: Old {symbol: {approaching_pips | approaching_distance}} overrides
+            dest: New-format overrides dict to fill
+            now_iso: Timestamp recorded as set_at on every migrated entry
+        """
+        for symbol, settings in entries.items():
+            if not isinstance(settings, dict) or symbol in dest:
+                continue
+
+            # Extract override value and type
+            if 'approaching_pips' in settings:
+                distance_type, value = "pips", settings['approaching_pips']
+            elif 'approaching_distance' in settings:
+                distance_type, value = "dollars", settings['approaching_distance']
+            else:
+                continue
+
+            dest[symbol] = {
+                "type": distance_type,
+                "value": value,
+                "set_by": "Migration",
+                "set_at": now_iso
+            }
+
     def _validate_config(self):
         """Validate configuration structure"""
         required_keys = ["defaults", "overrides"]
 
         for key in required_keys:
-            if key not in self.config:
-                logger.error(f"Missing required key in config: {key}")
+            if not isinstance(self.config.get(key), dict):
+                logger.error(f"Missing or invalid required key in config: {key}")
                 self.config = self._create_default_config()
                 return
 
@@ -309,6 +383,20 @@ class AlertDistanceConfig:
             if "description" not in settings:
                 settings["description"] = f"Default for {asset_class}"
 
+        # Validate overrides once here so lookups can index type/value directly;
+        # drop entries that can't be used rather than failing on every tick
+        overrides = self.config["overrides"]
+        for symbol, settings in list(overrides.items()):
+            if (not isinstance(settings, dict)
+                    or settings.get("type") not in ("pips", "dollars", "percentage")
+                    or not isinstance(settings.get("value"), (int, float))):
+                logger.error(f"Invalid override for {symbol}, ignoring: {settings}")
+                del overrides[symbol]
+
+        # Lookups are by uppercased symbol; normalize hand-edited / migrated keys once here
+        if any(not symbol.isupper() for symbol in overrides):
+            self.config["overrides"] = {symbol.upper(): settings for symbol, settings in overrides.items()}
+
         logger.debug("Configuration validated successfully")
 
     def _save_config(self, config: Dict = None):
@@ -316,17 +404,67 @@ class AlertDistanceConfig:
         if config is None:
             config = self.config
 
+        # Any save means the config changed (callers also edit defaults in place)
+        self._invalidate_cache()
+
         try:
             # Ensure directory exists
             self.config_path.parent.mkdir(parents=True, exist_ok=True)
 
-            with open(self.config_path, 'w') as f:
-                json.dump(config, f, indent=2)
+            # Serialize fully before touching the file, then swap it in atomically
+            # so a failed or interrupted save can't leave a truncated config
+            if orjson:
+                data = orjson.dumps(config, option=orjson.OPT_INDENT_2)
+            else:
+                data = json.dumps(config, indent=2).encode()
+            tmp_path = self.config_path.with_name(self.config_path.name + '.tmp')
+            tmp_path.write_bytes(data)
+            os.replace(tmp_path, self.config_path)
             logger.info("Configuration saved successfully")
         except Exception as e:
             logger.error(f"Failed to save configuration: {e}")
             raise
 
+    def save_soon(self):
+        """
+        Persist the config after SAVE_DEBOUNCE, coalescing bursts of edits
+
+        Lookups see the change immediately; only the file write is delayed.
+        Without a running event loop the config is written straight away.
+        """
+        self._invalidate_cache()
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            self._save_config()
+            return
+
+        self._dirty = True
+        if self._save_handle is None:
+            self._save_handle = loop.call_later(SAVE_DEBOUNCE, self.flush)
+
+    def flush(self):
+        """Write any pending debounced save now"""
+        if self._save_handle is not None:
+            self._save_handle.cancel()
+            self._save_handle = None
+        if self._dirty:
+            self._dirty = False
+            try:
+                self._save_config()
+            except Exception:
+                # Already logged by _save_config; keep the change pending
+                self._dirty = True
+
+    def _invalidate_cache(self):
+        """Drop memoized per-symbol lookups (call after any config change)"""
+        self._symbol_config_cache.clear()
+
+    def _prebuild_overrides(self):
+        """Resolve every overridden symbol up front; other symbols resolve on first use"""
+        for symbol_upper in self.config["overrides"]:
+            self._get_config_for_symbol(symbol_upper)
+
     def get_approaching_distance(self, symbol: str, current_price: float = None) -> float:
         """
         Get approaching alert distance for a symbol in absolute price units
@@ -339,32 +477,26 @@ class AlertDistanceConfig:
             Distance in absolute price units (e.g., 0.0010 for 10 pips in EURUSD)
         """
         config = self._get_config_for_symbol(symbol)
-        distance_type = config["type"]
-        value = config["value"]
 
-        if distance_type == "pips":
-            # Convert pips to price units
-            pip_size = self.get_pip_size(symbol)
-            return value * pip_size
+        # Pips / dollars don't depend on price and were converted at resolve time
+        distance = config["distance"]
+        if distance is not None:
+            return distance
 
-        elif distance_type == "dollars":
-            # Dollars are already in price units
-            return value
-
-        elif distance_type == "percentage":
-            # Convert percentage to price units
+        # Percentage: the factor is precomputed, only the live price varies
+        price_factor = config["price_factor"]
+        if price_factor is not None:
             if current_price is None:
                 logger.error(f"Current price required for percentage calculation: {symbol}")
                 # Fallback to a reasonable default
                 return self._get_fallback_distance(symbol)
 
-            return (value / 100.0) * current_price
+            return price_factor * current_price
 
-        else:
-            logger.error(f"Unknown distance type: {distance_type}")
-            return self._get_fallback_distance(symbol)
+        logger.error(f"Unknown distance type: {config['type']}")
+        return self._get_fallback_distance(symbol)
 
-    def _get_config_for_symbol(self, symbol: str) -> Dict:
+    def _get_config_for_symbol(self, symbol: str) -> Mapping:
         """
         Get configuration for a specific symbol (check overrides first)
 
@@ -372,34 +504,62 @@ class AlertDistanceConfig:
             symbol: Trading symbol
 
         Returns:
-            Dict with 'type' and 'value' keys
+            Read-only mapping with 'type', 'value', 'pip_size', 'distance' and
+            'price_factor' keys
         """
-        symbol_upper = symbol.upper()
+        # Called per tick per symbol; the result only changes with the config.
+        # Instruments are normally already uppercase, so try the key as given
+        # before allocating an uppercased copy
+        cached = self._symbol_config_cache.get(symbol)
+        if cached is None:
+            symbol_upper = symbol.upper()
+            cached = self._symbol_config_cache.get(symbol_upper)
+            if cached is None:
+                cached = self._symbol_config_cache[symbol_upper] = self._resolve_config(symbol_upper)
+        return cached
 
+    def _resolve_config(self, symbol_upper: str) -> Mapping:
+        """Resolve the config entry for an uppercased symbol (uncached)"""
         # Check for override first
         if symbol_upper in self.config["overrides"]:
             override = self.config["overrides"][symbol_upper]
-            return {
-                "type": override["type"],
-                "value": override["value"]
-            }
+            return self._build_entry(symbol_upper, override["type"], override["value"])
 
         # Use default based on asset class
-        asset_class = self._determine_asset_class(symbol)
+        asset_class = self._determine_asset_class(symbol_upper)
 
         if asset_class in self.config["defaults"]:
             default = self.config["defaults"][asset_class]
-            return {
-                "type": default["type"],
-                "value": default["value"]
-            }
+            return self._build_entry(symbol_upper, default["type"], default["value"])
 
         # Ultimate fallback
-        logger.warning(f"No config found for {symbol}, using forex default")
-        return {
-            "type": "pips",
-            "value": 10.0
-        }
+        logger.warning(f"No config found for {symbol_upper}, using forex default")
+        return self._build_entry(symbol_upper, "pips", 10.0)
+
+    def _build_entry(self, symbol_upper: str, distance_type: str, value: float) -> Mapping:
+        """
+        Build a resolved (read-only) config entry
+
+        'distance' is the approaching distance in price units for pips and
+        dollars (price-independent), or None when it needs the live price.
+        'price_factor' is the multiplier applied to the live price for
+        percentage distances, or None otherwise.
+        """
+        pip_size = self._detect_pip_size(symbol_upper)
+        distance = price_factor = None
+        if distance_type == "pips":
+            distance = value * pip_size
+        elif distance_type == "dollars":
+            distance = value
+        elif distance_type == "percentage":
+            price_factor = value / 100.0
+        return MappingProxyType({
+            "type": distance_type,
+            "value": value,
+            "pip_size": pip_size,
+            "distance": distance,
+            "price_factor": price_factor
+        })
 
     def _determine_asset_class(self, symbol: str) -> str:
         """
@@ -407,10 +567,19 @@ class AlertDistanceConfig:
 
         Returns: 'forex', 'forex_jpy', 'metals', 'indices', 'stocks', 'crypto', 'oil'
         """
+        symbol_upper = symbol.upper()
+        asset_class = self._asset_class_cache.get(symbol_upper)
+        if asset_class is None:
+            asset_class = self._asset_class_cache[symbol_upper] = self._detect_asset_class(symbol_upper)
+        return asset_class
+
+    def _detect_asset_class(self, symbol: str) -> str:
+        """Classify an uppercased symbol (uncached)"""
         # Use SymbolMapper if available
-        if self.mapper:
+        mapper = self.mapper
+        if mapper:
             try:
-                asset_class = self.mapper.determine_asset_class(symbol)
+                asset_class = mapper.determine_asset_class(symbol)
                 return asset_class
             except Exception as e:
                 logger.warning(f"SymbolMapper failed for {symbol}: {e}, using fallback")
@@ -419,36 +588,31 @@ class AlertDistanceConfig:
         symbol_upper = symbol.upper()
 
         # Check crypto
-        if any(crypto in symbol_upper for crypto in ['BTC', 'ETH', 'BNB', 'XRP', 'ADA', 'DOGE', 'SOL', 'DOT']):
-            return 'crypto'
-        if 'USDT' in symbol_upper:
+        if _CRYPTO_RE.search(symbol_upper):
             return 'crypto'
 
         # Check metals
-        if any(metal in symbol_upper for metal in ['XAU', 'XAG', 'GOLD', 'SILVER']):
+        if _METALS_RE.search(symbol_upper):
             return 'metals'
 
         # Check oil
-        if any(oil in symbol_upper for oil in ['WTI', 'BRENT', 'OIL', 'USOIL', 'USOILSPOT']):
+        if _OIL_RE.search(symbol_upper):
             return 'oil'
 
         # Check indices
-        if any(idx in symbol_upper for idx in ['SPX', 'NAS', 'DOW', 'DAX', 'CHINA50', 'US500', 'USTEC', 'US30',
-                                               'US2000', 'RUSSELL', 'GER', 'DE30', 'DE40', 'JP225', 'NIKKEI']):
+        if _INDICES_RE.search(symbol_upper):
             return 'indices'
 
-        # Check stocks
-        if '.' in symbol or any(exchange in symbol_upper for exchange in ['.NAS', '.NYSE', '.LON']):
+        # Check stocks (exchange-suffixed, e.g. AAPL.NAS)
+        if '.' in symbol:
             return 'stocks'
 
         # Check forex - JPY pairs get special handling
-        forex_currencies = ['EUR', 'USD', 'GBP', 'JPY', 'AUD', 'NZD', 'CAD', 'CHF']
-
         if len(symbol_upper) == 6:
             currency1 = symbol_upper[:3]
             currency2 = symbol_upper[3:]
 
-            if currency1 in forex_currencies and currency2 in forex_currencies:
+            if currency1 in _FOREX_CURRENCIES and currency2 in _FOREX_CURRENCIES:
                 if 'JPY' in symbol_upper:
                     return 'forex_jpy'
                 return 'forex'
@@ -466,14 +630,17 @@ class AlertDistanceConfig:
         Returns:
             Pip size (e.g., 0.0001 for EURUSD, 0.01 for USDJPY)
         """
-        symbol_upper = symbol.upper()
+        # Resolved once per symbol alongside its distance config
+        return self._get_config_for_symbol(symbol)["pip_size"]
 
+    def _detect_pip_size(self, symbol_upper: str) -> float:
+        """Pip size for an uppercased symbol (uncached)"""
         # JPY pairs use 0.01
         if 'JPY' in symbol_upper:
             return 0.01
 
         # Indices use 1.0 (points)
-        if any(idx in symbol_upper for idx in ['SPX', 'NAS', 'DOW', 'DAX', 'US500', 'USTEC', 'US30']):
+        if _PIP_INDICES_RE.search(symbol_upper):
             return 1.0
 
         # Metals
@@ -492,18 +659,7 @@ class AlertDistanceConfig:
     def _get_fallback_distance(self, symbol: str) -> float:
         """Fallback distance when calculation fails"""
         asset_class = self._determine_asset_class(symbol)
-
-        fallbacks = {
-            'forex': 0.0010,  # 10 pips
-            'forex_jpy': 0.20,  # 20 pips
-            'metals': 10.0,  # $10
-            'indices': 50.0,  # 50 points
-            'stocks': 1.0,  # $1
-            'crypto': 100.0,  # $100
-            'oil': 0.5  # $0.50
-        }
-
-        return fallbacks.get(asset_class, 0.0010)
+        return _FALLBACK_DISTANCES.get(asset_class, 0.0010)
 
     def set_override(self, symbol: str, value: float, distance_type: DistanceType,
                     set_by: str = "User") -> bool:
@@ -538,8 +694,8 @@ class AlertDistanceConfig:
             "set_at": datetime.now(timezone.utc).isoformat()
         }
 
-        # Save to file
-        self._save_config()
+        # Save to file (debounced)
+        self.save_soon()
 
         logger.info(f"Set alert distance override: {symbol_upper} = {value} {distance_type}")
         return True
@@ -558,7 +714,7 @@ class AlertDistanceConfig:
 
         if symbol_upper in self.config["overrides"]:
             del self.config["overrides"][symbol_upper]
-            self._save_config()
+            self.save_soon()
             logger.info(f"Removed alert distance override: {symbol_upper}")
             return True
         else:
@@ -622,8 +778,7 @@ class AlertDistanceConfig:
         distance_type = config["type"]
 
         if distance_type == "pips":
-            pip_size = self.get_pip_size(symbol)
-            pips = distance / pip_size
+            pips = distance / config["pip_size"]
             return f"{pips:.1f} pips"
 
         elif distance_type == "dollars":
@@ -652,7 +807,7 @@ class AlertDistanceConfig:
         config = self._get_config_for_symbol(symbol)
         distance_type = config["type"]
         value = config["value"]
-        pip_size = self.get_pip_size(symbol)
+        pip_size = config["pip_size"]
 
         if distance_type == "pips":
             return {
@@ -667,8 +822,13 @@ class AlertDistanceConfig:
 
     def reload_config(self):
         """Reload configuration from file"""
+        # Don't let a pending write be lost (or land on top of the reload)
+        self.flush()
         self.config = self._load_config()
         self._validate_config()
+        self._invalidate_cache()
+        self._asset_class_cache.clear()
+        self._prebuild_overrides()
         logger.info("Alert configuration reloaded")
 
 
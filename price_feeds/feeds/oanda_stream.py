@@ -12,6 +12,9 @@ from datetime import datetime
 
 logger = logging.getLogger(__name__)
 
+# OANDA sends a HEARTBEAT every 5s; treat a stream silent for this long (seconds) as dead
+STREAM_READ_TIMEOUT = 20
+
 
 class OANDAStream:
     """
@@ -50,16 +53,17 @@ class OANDAStream:
         logger.info("OANDAStream initialized")
 
     async def connect(self) -> bool:
-        """Initialize OANDA session"""
+        """Initialize OANDA session (reused across reconnects)"""
         try:
-            self.session = aiohttp.ClientSession(
-                headers={
-                    'Authorization': f'Bearer {self.api_key}',
-                    'Content-Type': 'application/json',
-                    'Accept-Datetime-Format': 'UNIX'
-                },
-                timeout=aiohttp.ClientTimeout(total=None)  # No timeout for streaming
-            )
+            if self.session is None or self.session.closed:
+                self.session = aiohttp.ClientSession(
+                    headers={
+                        'Authorization': f'Bearer {self.api_key}',
+                        'Content-Type': 'application/json',
+                        'Accept-Datetime-Format': 'UNIX'
+                    },
+                    timeout=aiohttp.ClientTimeout(total=None)  # No timeout for streaming
+                )
 
             # Test connection
             test_url = f"{self.base_url.replace('stream-', 'api-')}/v3/accounts/{self.account_id}/summary"
@@ -91,8 +95,19 @@ class OANDAStream:
         logger.info("Disconnected from OANDA")
 
     async def reconnect(self):
-        """Reconnect to OANDA"""
-        await self.disconnect()
+        """
+        Reconnect to OANDA
+
+        Only the stream is torn down; the session (and its pooled keep-alive
+        connections) is kept so reconnects skip a new connector and TLS setup.
+        """
+        self.streaming = False
+
+        if self.stream_response:
+            self.stream_response.close()
+            self.stream_response = None
+
+        self.connected = False
         await asyncio.sleep(2)
         return await self.connect()
 
@@ -171,8 +186,12 @@ class OANDAStream:
                 instruments = ','.join(self.subscribed_symbols)
                 params = {'instruments': instruments}
 
-                # Open streaming connection
-                async with self.session.get(self.stream_url, params=params) as response:
+                # Open streaming connection; the read timeout bounds how long a
+                # stalled connection can block before we reconnect
+                async with self.session.get(
+                        self.stream_url, params=params,
+                        timeout=aiohttp.ClientTimeout(total=None, sock_read=STREAM_READ_TIMEOUT)
+                ) as response:
                     if response.status != 200:
                         logger.error(f"OANDA stream failed: {response.status}")
                         await asyncio.sleep(5)
@@ -223,6 +242,11 @@ class OANDAStream:
                             logger.error(f"Error parsing OANDA message: {e}")
                             continue
 
+            # Must come before ClientError: aiohttp's read timeout (ServerTimeoutError)
+            # subclasses both, and a stalled stream should reconnect immediately
+            except asyncio.TimeoutError:
+                logger.warning(f"OANDA stream silent for {STREAM_READ_TIMEOUT}s, reconnecting")
+
             except aiohttp.ClientError as e:
                 logger.error(f"OANDA stream connection error: {e}")
                 await asyncio.sleep(5)
@@ -92,9 +92,9 @@ class NMConfig:
         self.config = self._load_config()
 
         try:
-            from price_feeds.symbol_mapper import SymbolMapper
+            from price_feeds.symbol_mapper import get_shared_mapper
             mapper_config = self.config_path.parent / "symbol_mappings.json"
-            self.mapper = SymbolMapper(str(mapper_config))
+            self.mapper = get_shared_mapper(str(mapper_config))
         except Exception as e:
             logger.warning(f"Could not initialise SymbolMapper in NMConfig: {e}")
             self.mapper = None
@@ -790,7 +790,7 @@ class StreamingPriceMonitor:
                 if hit_limits and stop_price:
                     combined = 0.0
                     for lim in hit_limits:
-                        entry = lim.get('hit_price') or lim.get('price_level')
+                        entry = lim['effective_price']
                         if entry is not None:
                             combined += self.tp_config.calculate_pnl(
                                 signal['instrument'], signal['direction'], entry, stop_price
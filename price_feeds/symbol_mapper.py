@@ -11,6 +11,7 @@ CRITICAL FIXES:
 
 import json
 import re
+from functools import lru_cache
 from typing import Dict, List, Optional, Tuple
 from pathlib import Path
 import logging
@@ -426,4 +427,15 @@ class SymbolMapper:
         """Reload configuration from file (useful for dynamic updates)"""
         self.mappings = self._load_mappings()
         self._compile_patterns()
-        logger.info("SymbolMapper configuration reloaded")
\ No newline at end of file
+        logger.info("SymbolMapper configuration reloaded")
+
+@lru_cache(maxsize=8)
+def get_shared_mapper(config_path: str = None) -> SymbolMapper:
+    """
+    Return a SymbolMapper shared by every caller using the same config file
+
+    The mapper is read-only after construction, so the alert distance, TP and
+    NM configs can share one instance instead of each re-reading and
+    re-compiling symbol_mappings.json.
+    """
+    return SymbolMapper(config_path)
@@ -15,14 +15,31 @@ P&L is always calculated in the same native unit as the TP type:
 
 import json
 import logging
+import os
 from pathlib import Path
-from typing import Dict, Literal, Optional
+from typing import Dict, List, Literal, Tuple
 from datetime import datetime, timezone
 
+try:
+    import orjson  # Faster parse/serialize; falls back to stdlib json
+except ImportError:
+    orjson = None
+
 logger = logging.getLogger(__name__)
 
 TPType = Literal["pips", "dollars"]
 
+# Fallback asset-class / pip-size detection tokens (used when SymbolMapper is unavailable)
+_CRYPTO_TOKENS = ("BTC", "ETH", "BNB", "XRP", "ADA", "DOGE", "SOL", "DOT", "USDT")
+_METAL_TOKENS = ("XAU", "XAG", "GOLD", "SILVER")
+_OIL_TOKENS = ("WTI", "BRENT", "OIL")
+_INDEX_TOKENS = ("SPX", "NAS", "DOW", "DAX", "US500", "USTEC", "US30",
+                 "US2000", "GER", "DE30", "DE40", "JP225", "CHINA50")
+_FOREX_CURRENCIES = frozenset({"EUR", "USD", "GBP", "JPY", "AUD", "NZD", "CAD", "CHF"})
+
+# Instruments quoted in points (pip size 1.0)
+_PIP_INDEX_TOKENS = ("SPX", "NAS", "DOW", "US500", "USTEC", "US30", "DAX")
+
 
 class TPConfig:
     """
@@ -55,14 +72,20 @@ class TPConfig:
         else:
             self.config_path = Path(config_path)
 
+        # Resolved {type, value} per (uppercased symbol, scalp); cleared whenever
+        # the config is saved or reloaded
+        self._symbol_config_cache: Dict[Tuple[str, bool], Dict] = {}
+        # Asset class per uppercased symbol (independent of the TP config)
+        self._asset_class_cache: Dict[str, str] = {}
+
         self.config = self._load_config()
         self._validate_config()
 
         # Borrow SymbolMapper for asset-class detection (same as alert_config)
         try:
-            from price_feeds.symbol_mapper import SymbolMapper
+            from price_feeds.symbol_mapper import get_shared_mapper
             mapper_config = self.config_path.parent / "symbol_mappings.json"
-            self.mapper = SymbolMapper(str(mapper_config))
+            self.mapper = get_shared_mapper(str(mapper_config))
         except Exception as e:
             logger.warning(f"Could not initialise SymbolMapper: {e}, using fallback detection")
             self.mapper = None
@@ -75,8 +98,9 @@ class TPConfig:
 
     def _load_config(self) -> Dict:
         try:
-            with open(self.config_path, "r") as f:
-                return json.load(f)
+            raw = self.config_path.read_bytes()
+            # orjson.JSONDecodeError subclasses json.JSONDecodeError, so the handler below covers both
+            return orjson.loads(raw) if orjson else json.loads(raw)
         except FileNotFoundError:
             logger.warning(f"TP config not found, creating default: {self.config_path}")
             return self._create_default_config()
@@ -138,10 +162,17 @@ class TPConfig:
     def _save_config(self, config: Dict = None):
         if config is None:
             config = self.config
+        self._symbol_config_cache.clear()
         try:
             self.config_path.parent.mkdir(parents=True, exist_ok=True)
-            with open(self.config_path, "w") as f:
-                json.dump(config, f, indent=2)
+            # Serialize fully, then swap the file in atomically (same as alert_config)
+            if orjson:
+                data = orjson.dumps(config, option=orjson.OPT_INDENT_2)
+            else:
+                data = json.dumps(config, indent=2).encode()
+            tmp_path = self.config_path.with_name(self.config_path.name + ".tmp")
+            tmp_path.write_bytes(data)
+            os.replace(tmp_path, self.config_path)
         except Exception as e:
             logger.error(f"Failed to save TP config: {e}")
             raise
@@ -151,6 +182,13 @@ class TPConfig:
     # ------------------------------------------------------------------
 
     def determine_asset_class(self, symbol: str) -> str:
+        s = symbol.upper()
+        asset_class = self._asset_class_cache.get(s)
+        if asset_class is None:
+            asset_class = self._asset_class_cache[s] = self._detect_asset_class(s)
+        return asset_class
+
+    def _detect_asset_class(self, symbol: str) -> str:
         if self.mapper:
             try:
                 return self.mapper.determine_asset_class(symbol)
@@ -160,20 +198,18 @@ class TPConfig:
         # Fallback (mirrors alert_config._determine_asset_class)
         s = symbol.upper()
 
-        if any(c in s for c in ["BTC", "ETH", "BNB", "XRP", "ADA", "DOGE", "SOL", "DOT"]) or "USDT" in s:
+        if any(c in s for c in _CRYPTO_TOKENS):
             return "crypto"
-        if any(c in s for c in ["XAU", "XAG", "GOLD", "SILVER"]):
+        if any(c in s for c in _METAL_TOKENS):
             return "metals"
-        if any(c in s for c in ["WTI", "BRENT", "OIL", "USOIL"]):
+        if any(c in s for c in _OIL_TOKENS):
             return "oil"
-        if any(c in s for c in ["SPX", "NAS", "DOW", "DAX", "US500", "USTEC", "US30",
-                                  "US2000", "GER", "DE30", "DE40", "JP225", "CHINA50"]):
+        if any(c in s for c in _INDEX_TOKENS):
             return "indices"
         if "." in s:
             return "stocks"
 
-        forex_ccys = {"EUR", "USD", "GBP", "JPY", "AUD", "NZD", "CAD", "CHF"}
-        if len(s) == 6 and s[:3] in forex_ccys and s[3:] in forex_ccys:
+        if len(s) == 6 and s[:3] in _FOREX_CURRENCIES and s[3:] in _FOREX_CURRENCIES:
             return "forex_jpy" if "JPY" in s else "forex"
 
         return "forex"  # safe default
@@ -183,13 +219,13 @@ class TPConfig:
         s = symbol.upper()
         if "JPY" in s:
             return 0.01
-        if any(c in s for c in ["XAU", "GOLD"]):
+        if "XAU" in s or "GOLD" in s:
             return 0.01
-        if any(c in s for c in ["XAG", "SILVER"]):
+        if "XAG" in s or "SILVER" in s:
             return 0.001
         if "BTC" in s:
             return 1.0
-        if any(c in s for c in ["SPX", "NAS", "DOW", "US500", "USTEC", "US30", "DAX"]):
+        if any(c in s for c in _PIP_INDEX_TOKENS):
             return 1.0
         return 0.0001  # Standard forex
 
@@ -199,16 +235,24 @@ class TPConfig:
 
     def _get_config_for_symbol(self, symbol: str, scalp: bool = False) -> Dict:
         """Return {type, value} for a symbol, respecting overrides and scalp mode."""
-        s = symbol.upper()
+        # Called per tick per signal; the result only changes with the config
+        key = (symbol.upper(), scalp)
+        cached = self._symbol_config_cache.get(key)
+        if cached is None:
+            cached = self._symbol_config_cache[key] = self._resolve_config(*key)
+        return cached
+
+    def _resolve_config(self, s: str, scalp: bool) -> Dict:
+        """Resolve {type, value} for an uppercased symbol (uncached)."""
 
         if scalp:
             # Check scalp overrides first
-            if s in self.config.get("scalp_overrides", {}):
+            if s in self.config["scalp_overrides"]:
                 ov = self.config["scalp_overrides"][s]
                 return {"type": ov["type"], "value": ov["value"]}
             # Fall back to scalp defaults
             asset_class = self.determine_asset_class(s)
-            scalp_defaults = self.config.get("scalp_defaults", {})
+            scalp_defaults = self.config["scalp_defaults"]
             if asset_class in scalp_defaults:
                 d = scalp_defaults[asset_class]
                 return {"type": d["type"], "value": d["value"]}
@@ -270,6 +314,41 @@ class TPConfig:
         else:  # dollars
             return raw_diff
 
+    def calculate_pnl_batch(self, symbol: str, direction: str,
+                            entry_prices: List[float], current_price: float,
+                            scalp: bool = False) -> float:
+        """
+        Calculate the combined P&L of several limit positions in native units.
+
+        Equivalent to summing calculate_pnl() over entry_prices, but the TP
+        type and pip size are resolved once for the whole batch.
+
+        Args:
+            symbol: Instrument name
+            direction: 'long' or 'short'
+            entry_prices: hit_price of each limit
+            current_price: exit / current market price
+            scalp: Whether to use scalp TP config
+
+        Returns:
+            Combined P&L in native units (pips or dollars)
+        """
+        if not entry_prices:
+            return 0.0
+
+        tp_type = self.get_tp_type(symbol, scalp=scalp)
+
+        total_entry = sum(entry_prices)
+        total_exit = current_price * len(entry_prices)
+        if direction == "long":
+            raw_diff = total_exit - total_entry
+        else:
+            raw_diff = total_entry - total_exit
+
+        if tp_type == "pips":
+            return raw_diff / self.get_pip_size(symbol)
+        return raw_diff
+
     def set_override(self, symbol: str, value: float, tp_type: TPType,
                      set_by: str = "User", scalp: bool = False) -> bool:
         """Set a per-symbol TP override. Returns True on success."""
@@ -281,9 +360,6 @@ class TPConfig:
             return False
 
         section = "scalp_overrides" if scalp else "overrides"
-        if section not in self.config:
-            self.config[section] = {}
-
         self.config[section][symbol.upper()] = {
             "type": tp_type,
             "value": value,
@@ -298,7 +374,7 @@ class TPConfig:
                     set_by: str = "User", scalp: bool = False) -> bool:
         """Update the default TP for an asset class. Returns True on success."""
         section = "scalp_defaults" if scalp else "defaults"
-        if asset_class not in self.config.get(section, {}):
+        if asset_class not in self.config[section]:
             logger.error(f"Unknown asset class: {asset_class} in {section}")
             return False
         if tp_type not in ("pips", "dollars"):
@@ -318,7 +394,7 @@ class TPConfig:
         """Remove a per-symbol override. Returns True if one existed."""
         s = symbol.upper()
         section = "scalp_overrides" if scalp else "overrides"
-        if s in self.config.get(section, {}):
+        if s in self.config[section]:
             del self.config[section][s]
             self._save_config()
             logger.info(f"Removed {'scalp ' if scalp else ''}TP override: {s}")
@@ -329,6 +405,8 @@ class TPConfig:
         """Reload configuration from disk."""
         self.config = self._load_config()
         self._validate_config()
+        self._symbol_config_cache.clear()
+        self._asset_class_cache.clear()
         logger.info("TP configuration reloaded")
 
     def get_display_info(self, symbol: str = None, scalp: bool = False) -> Dict:
@@ -338,7 +416,7 @@ class TPConfig:
             cfg = self._get_config_for_symbol(s, scalp=scalp)
             asset_class = self.determine_asset_class(s)
             section = "scalp_overrides" if scalp else "overrides"
-            is_override = s in self.config.get(section, {})
+            is_override = s in self.config[section]
             result = {
                 "symbol": s,
                 "type": cfg["type"],
@@ -355,11 +433,11 @@ class TPConfig:
 
         return {
             "defaults": self.config["defaults"],
-            "scalp_defaults": self.config.get("scalp_defaults", {}),
+            "scalp_defaults": self.config["scalp_defaults"],
             "overrides": self.config["overrides"],
-            "scalp_overrides": self.config.get("scalp_overrides", {}),
+            "scalp_overrides": self.config["scalp_overrides"],
             "total_overrides": len(self.config["overrides"]),
-            "total_scalp_overrides": len(self.config.get("scalp_overrides", {})),
+            "total_scalp_overrides": len(self.config["scalp_overrides"]),
         }
 
     def format_value(self, symbol: str, value: float) -> str:
@@ -115,7 +115,7 @@ class AutoTPMonitor:
         close_price = current_bid if direction == "long" else current_ask
 
         # P&L for the last limit
-        last_entry = last_limit.get("hit_price") or last_limit.get("price_level")
+        last_entry = last_limit["effective_price"]
         if last_entry is None:
             logger.warning(f"Signal {signal_id}: last limit has no entry price, skipping TP check")
             return False
@@ -135,7 +135,7 @@ class AutoTPMonitor:
         if earlier_limits:
             combined_earlier_pnl = 0.0
             for lim in earlier_limits:
-                entry = lim.get("hit_price") or lim.get("price_level")
+                entry = lim["effective_price"]
                 if entry is None:
                     logger.warning(f"Signal {signal_id}: limit {lim.get('limit_id')} has no entry price")
                     continue
@@ -150,7 +150,7 @@ class AutoTPMonitor:
         cumulative_pnl = last_pnl
         if earlier_limits:
             for lim in earlier_limits:
-                entry = lim.get("hit_price") or lim.get("price_level")
+                entry = lim["effective_price"]
                 if entry is not None:
                     cumulative_pnl += self.tp_config.calculate_pnl(
                         instrument, direction, entry, close_price, scalp=scalp
@@ -186,7 +186,7 @@ class AutoTPMonitor:
         if close_price is not None:
             for lim in hit_limits:
                 seq = lim.get("sequence_number")
-                entry = lim.get("hit_price") or lim.get("price_level")
+                entry = lim["effective_price"]
                 if seq is not None and entry is not None:
                     pnl = self.tp_config.calculate_pnl(instrument, direction, entry, close_price, scalp=scalp)
                     limit_pnl_map[seq] = self.tp_config.format_value(instrument, pnl)
@@ -0,0 +1,8 @@
+"""
+Shared test setup
+"""
+import os
+
+# Importing the database package builds the global DatabaseManager, which
+# needs a URL; the pool is only created on connect(), which no test calls
+os.environ.setdefault("SUPABASE_DB_URL", "postgresql://localhost/test")
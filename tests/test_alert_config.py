@@ -0,0 +1,98 @@
+"""
+Tests for AlertDistanceConfig
+"""
+import json
+
+import pytest
+
+from price_feeds.alert_config import SCHEMA_VERSION, AlertDistanceConfig
+
+
+def _write(path, config):
+    path.write_text(json.dumps(config))
+    return str(path)
+
+
+def _new_format(overrides=None, **extra):
+    config = {
+        "defaults": {
+            "forex": {"type": "pips", "value": 10.0, "description": "Forex"},
+            "metals": {"type": "dollars", "value": 5.0, "description": "Metals"},
+        },
+        "overrides": overrides or {},
+    }
+    config.update(extra)
+    return config
+
+
+def test_override_changes_invalidate_resolved_entries(tmp_path):
+    config = AlertDistanceConfig(_write(tmp_path / "alert_distances.json", _new_format()))
+    assert config.get_approaching_distance("EURUSD") == pytest.approx(10.0 * 0.0001)
+
+    config.set_override("EURUSD", 3.0, "pips")
+    assert config.get_approaching_distance("EURUSD") == pytest.approx(3.0 * 0.0001)
+
+    config.remove_override("EURUSD")
+    assert config.get_approaching_distance("EURUSD") == pytest.approx(10.0 * 0.0001)
+
+
+def test_validate_drops_invalid_overrides_and_uppercases_keys(tmp_path):
+    config = AlertDistanceConfig(_write(tmp_path / "alert_distances.json", _new_format({
+        "eurusd": {"type": "pips", "value": 5},
+        "XAUUSD": {"type": "dollars", "value": 2.5},
+        "BADTYPE": {"type": "points", "value": 1},
+        "NOVALUE": {"type": "pips"},
+        "NOTADICT": 3,
+    })))
+
+    assert set(config.config["overrides"]) == {"EURUSD", "XAUUSD"}
+    assert config.get_approaching_distance("eurusd") == pytest.approx(5 * 0.0001)
+    assert config.get_approaching_distance("XAUUSD") == 2.5
+
+
+def test_old_format_overrides_are_migrated(tmp_path):
+    path = tmp_path / "alert_distances.json"
+    config = AlertDistanceConfig(_write(path, {
+        "defaults": {"forex": {"approaching_pips": 12, "pip_size": 0.0001}},
+        "overrides": {"EURUSD": {"approaching_pips": 5}},
+        "dynamic_overrides": {"EURUSD": {"approaching_pips": 9}, "XAUUSD": {"approaching_distance": 3}},
+    }))
+
+    assert config.config["defaults"]["forex"]["value"] == 12
+    # Static overrides win over dynamic ones for the same symbol
+    assert config.config["overrides"]["EURUSD"]["value"] == 5
+    # Every migrated entry shares one timestamp
+    assert config.config["overrides"]["XAUUSD"] == {
+        "type": "dollars", "value": 3, "set_by": "Migration",
+        "set_at": config.config["overrides"]["EURUSD"]["set_at"],
+    }
+    assert config.config["schema_version"] == SCHEMA_VERSION
+    assert json.loads(path.read_text())["schema_version"] == SCHEMA_VERSION
+
+
+def test_default_config_is_stamped_with_schema_version(tmp_path):
+    path = tmp_path / "alert_distances.json"
+    config = AlertDistanceConfig(str(path))
+
+    assert config.config["schema_version"] == SCHEMA_VERSION
+    assert json.loads(path.read_text())["schema_version"] == SCHEMA_VERSION
+
+
+def test_unstamped_new_format_is_not_remigrated(tmp_path):
+    config = AlertDistanceConfig(_write(tmp_path / "alert_distances.json",
+                                        _new_format({"GBPUSD": {"type": "pips", "value": 4.0}})))
+
+    assert config.config["defaults"]["forex"]["value"] == 10.0
+    assert config.config["overrides"]["GBPUSD"]["value"] == 4.0
+    assert config.config["schema_version"] == SCHEMA_VERSION
+
+
+def test_stamped_config_skips_format_probe(tmp_path, monkeypatch):
+    def fail(*args):
+        raise AssertionError("_is_new_format should not run for a stamped config")
+
+    monkeypatch.setattr(AlertDistanceConfig, "_is_new_format", fail)
+    config = AlertDistanceConfig(_write(tmp_path / "alert_distances.json",
+                                        _new_format(schema_version=SCHEMA_VERSION)))
+
+    assert config.get_approaching_distance("EURUSD") == pytest.approx(10.0 * 0.0001)
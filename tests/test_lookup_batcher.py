@@ -0,0 +1,120 @@
+"""
+Tests for SignalLookupBatcher
+"""
+import asyncio
+
+import pytest
+
+pytest.importorskip("dotenv")
+pytest.importorskip("asyncpg")
+
+from database.signal_operations import lookup_batcher
+from database.signal_operations.lookup_batcher import SignalLookupBatcher
+
+
+class FakeSignalDB:
+    """Records single and batched lookups"""
+
+    def __init__(self, signals=None, error=None, block=None):
+        self.signals = signals or {}
+        self.error = error
+        self.block = block
+        self.single_lookups = []
+        self.batch_lookups = []
+
+    async def get_signal_by_message_id(self, message_id):
+        self.single_lookups.append(message_id)
+        if self.block:
+            await self.block.wait()
+        if self.error:
+            raise self.error
+        return self.signals.get(message_id)
+
+    async def get_signals_by_message_ids(self, message_ids):
+        self.batch_lookups.append(list(message_ids))
+        if self.error:
+            raise self.error
+        return {m: self.signals[m] for m in message_ids if m in self.signals}
+
+
+def test_single_lookup_uses_single_row_query():
+    async def run():
+        signal_db = FakeSignalDB(signals={"100": {"id": 1}})
+        batcher = SignalLookupBatcher(signal_db)
+        try:
+            return signal_db, await batcher.get_signal_by_message_id("100")
+        finally:
+            await batcher.stop()
+
+    signal_db, signal = asyncio.run(run())
+
+    assert signal == {"id": 1}
+    assert signal_db.single_lookups == ["100"]
+    assert signal_db.batch_lookups == []
+
+
+def test_concurrent_lookups_are_coalesced_and_deduplicated():
+    async def run():
+        signal_db = FakeSignalDB(signals={"100": {"id": 1}, "200": {"id": 2}})
+        batcher = SignalLookupBatcher(signal_db)
+        try:
+            results = await asyncio.gather(
+                batcher.get_signal_by_message_id("100"),
+                batcher.get_signal_by_message_id("200"),
+                batcher.get_signal_by_message_id("100"),
+                batcher.get_signal_by_message_id("300"),
+            )
+            return signal_db, results
+        finally:
+            await batcher.stop()
+
+    signal_db, results = asyncio.run(run())
+
+    assert results == [{"id": 1}, {"id": 2}, {"id": 1}, None]
+    assert signal_db.batch_lookups == [["100", "200", "300"]]
+    assert signal_db.single_lookups == []
+
+
+def test_query_errors_propagate_to_every_waiter():
+    async def run():
+        batcher = SignalLookupBatcher(FakeSignalDB(error=RuntimeError("db down")))
+        try:
+            return await asyncio.gather(
+                batcher.get_signal_by_message_id("100"),
+                batcher.get_signal_by_message_id("200"),
+                return_exceptions=True,
+            )
+        finally:
+            await batcher.stop()
+
+    results = asyncio.run(run())
+
+    assert len(results) == 2
+    assert all(isinstance(r, RuntimeError) for r in results)
+
+
+def test_lone_lookup_does_not_wait_for_the_batching_window(monkeypatch):
+    # A window far longer than the test: the lookup must not sit it out
+    monkeypatch.setattr(lookup_batcher, "FLUSH_INTERVAL", 60)
+
+    async def run():
+        batcher = SignalLookupBatcher(FakeSignalDB(signals={"100": {"id": 1}}))
+        try:
+            return await asyncio.wait_for(batcher.get_signal_by_message_id("100"), timeout=1)
+        finally:
+            await batcher.stop()
+
+    assert asyncio.run(run()) == {"id": 1}
+
+
+def test_stop_answers_lookups_in_flight():
+    async def run():
+        signal_db = FakeSignalDB(signals={"100": {"id": 1}}, block=asyncio.Event())
+        batcher = SignalLookupBatcher(signal_db)
+        lookup = asyncio.ensure_future(batcher.get_signal_by_message_id("100"))
+        while not signal_db.single_lookups:
+            await asyncio.sleep(0)
+        await batcher.stop()
+        return await asyncio.wait_for(lookup, timeout=1)
+
+    assert asyncio.run(run()) is None
@@ -0,0 +1,160 @@
+"""
+Tests for reply-to-manage command routing in MessageHandler
+"""
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+
+pytest.importorskip("discord")
+pytest.importorskip("dotenv")
+pytest.importorskip("asyncpg")
+pytest.importorskip("pytz")
+
+from discord_handlers import message_handler
+from discord_handlers.message_handler import _COMMAND_BY_ACTION, _COMMAND_TABLE
+
+
+@pytest.mark.parametrize("alias, status", [
+    ("cancel", "cancelled"), ("nm", "cancelled"), ("cancelled", "cancelled"),
+    ("profit", "profit"), ("win", "profit"), ("tp", "profit"),
+    ("hit", "hit"),
+    ("breakeven", "breakeven"), ("be", "breakeven"),
+    ("sl", "stop_loss"), ("stop", "stop_loss"), ("stoploss", "stop_loss"), ("stop loss", "stop_loss"),
+    ("reactivate", None), ("reopen", None), ("active", None),
+])
+def test_alias_routes_to_command(alias, status):
+    assert _COMMAND_TABLE[alias].status == status
+
+
+def test_unknown_reply_is_not_a_command():
+    for text in ("", "sl please", "profits", "STOP"):
+        assert _COMMAND_TABLE.get(text) is None
+
+
+def test_action_label_maps_back_to_its_command():
+    commands = set(_COMMAND_TABLE.values())
+
+    assert len(commands) == 6
+    assert {_COMMAND_BY_ACTION[cmd.action] for cmd in commands} == commands
+    # Each command gets its own reaction / ping emoji
+    assert len({cmd.emoji for cmd in commands}) == len(commands)
+
+
+class FakeBatcher:
+    def __init__(self):
+        self.calls = []
+
+    async def set_status(self, signal_id, status, reason=None, result_pips=None, closed_reason=None):
+        self.calls.append((signal_id, status, reason, result_pips))
+        return True
+
+
+class FakeSignalDB:
+    def __init__(self):
+        self.calls = []
+
+    async def close_signal_as_stoploss(self, signal_id, reason, pnl_calculator):
+        self.calls.append(("close_signal_as_stoploss", signal_id, reason, pnl_calculator))
+        return True
+
+    async def manually_set_signal_to_hit(self, signal_id, reason):
+        self.calls.append(("manually_set_signal_to_hit", signal_id, reason))
+        return True
+
+    async def get_signal_with_limits(self, signal_id):
+        self.calls.append(("get_signal_with_limits", signal_id))
+        return {"id": signal_id, "instrument": "EURUSD", "hit_limits": [{"id": 11}]}
+
+
+class FakeDB:
+    def __init__(self):
+        self.hits = []
+
+    async def mark_limit_hit(self, limit_id, price):
+        self.hits.append((limit_id, price))
+
+
+class FakeTPConfig:
+    def get_tp_value(self, symbol, scalp=False):
+        return 10.0
+
+    def calculate_pnl_batch(self, *args, **kwargs):
+        return 0.0
+
+
+@pytest.fixture
+def handler(monkeypatch):
+    handler = message_handler.MessageHandler.__new__(message_handler.MessageHandler)
+    handler.bot = SimpleNamespace(monitor=None)
+    handler.logger = message_handler.logger
+    handler.signal_db = FakeSignalDB()
+    handler.status_batcher = FakeBatcher()
+    handler.tp_config = FakeTPConfig()
+    fake_db = FakeDB()
+    monkeypatch.setattr(message_handler, "db", fake_db)
+    handler.fake_db = fake_db
+    return handler
+
+
+def _approaching_signal():
+    return {"id": 5, "instrument": "EURUSD", "hit_limits": [],
+            "pending_limits": [{"id": 12, "price_level": 1.08, "sequence_number": 2},
+                               {"id": 11, "price_level": 1.09, "sequence_number": 1}]}
+
+
+def _apply(handler, alias, **kwargs):
+    cmd = _COMMAND_TABLE[alias]
+    return asyncio.run(handler._apply_management_command(cmd, 5, _approaching_signal(), "why", **kwargs))
+
+
+def test_signal_reply_profit_does_not_mark_limits_hit(handler):
+    success, _ = _apply(handler, "tp")
+
+    assert success is True
+    assert handler.fake_db.hits == []
+    assert handler.status_batcher.calls == [(5, "profit", "why", 10.0)]
+
+
+def test_alert_reply_profit_marks_first_pending_limit_hit(handler):
+    success, signal = _apply(handler, "profit", auto_hit_first_limit=True)
+
+    assert success is True
+    assert handler.fake_db.hits == [(11, 1.09)]
+    # Re-read so the embed sees the hit limit
+    assert signal["hit_limits"] == [{"id": 11}]
+    assert handler.status_batcher.calls == [(5, "profit", "why", 10.0)]
+
+
+def test_stop_loss_goes_through_the_single_transaction_close(handler):
+    success, _ = _apply(handler, "sl")
+
+    assert success is True
+    assert handler.signal_db.calls == [
+        ("close_signal_as_stoploss", 5, "why", handler.tp_config.calculate_pnl_batch)
+    ]
+    assert handler.status_batcher.calls == []
+
+
+def test_hit_marks_signal_hit(handler):
+    success, _ = _apply(handler, "hit")
+
+    assert success is True
+    assert handler.signal_db.calls == [("manually_set_signal_to_hit", 5, "why")]
+
+
+def test_breakeven_is_a_plain_status_write(handler):
+    success, _ = _apply(handler, "be")
+
+    assert success is True
+    assert handler.status_batcher.calls == [(5, "breakeven", "why", None)]
+    assert handler.signal_db.calls == []
+
+
+def test_unknown_action_does_not_fetch_the_original_signal(handler):
+    fetched = []
+    handler.bot = SimpleNamespace(get_channel=fetched.append)
+
+    asyncio.run(handler._react_to_original_signal({"message_id": "1", "channel_id": "2"}, "unknown"))
+
+    assert fetched == []
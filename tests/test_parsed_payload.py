@@ -0,0 +1,44 @@
+"""
+Tests for the signals.parsed_payload (de)serialization helpers
+"""
+import json
+
+import pytest
+
+pytest.importorskip("dotenv")
+pytest.importorskip("asyncpg")
+pytest.importorskip("pytz")
+
+from core.parser import ParsedSignal
+from database.signal_operations.utils import deserialize_parsed_signal, serialize_parsed_signal
+
+
+def _signal():
+    return ParsedSignal(
+        instrument="XAUUSD",
+        direction="long",
+        limits=[2350.5, 2345.0],
+        stop_loss=2330.0,
+        expiry_type="week_end",
+        raw_text="gold long 2350.5 2345 sl 2330",
+        parse_method="high_confidence",
+        keywords=["gold"],
+        channel_name="gold-signals",
+        scalp=True,
+    )
+
+
+def test_round_trip_from_string():
+    signal = _signal()
+    assert deserialize_parsed_signal(serialize_parsed_signal(signal)) == signal
+
+
+def test_round_trip_from_decoded_dict():
+    signal = _signal()
+    payload = json.loads(serialize_parsed_signal(signal))
+    assert deserialize_parsed_signal(payload) == signal
+
+
+@pytest.mark.parametrize("payload", [None, "", "not json", '{"instrument": "EURUSD"}'])
+def test_unusable_payload_returns_none(payload):
+    assert deserialize_parsed_signal(payload) is None
@@ -0,0 +1,199 @@
+"""
+Tests for LifecycleManager manual status writes
+"""
+import asyncio
+from contextlib import asynccontextmanager
+
+import pytest
+
+pytest.importorskip("dotenv")
+pytest.importorskip("asyncpg")
+pytest.importorskip("pytz")
+
+from database.signal_operations.lifecycle import LifecycleManager
+from price_feeds.tp_config import TPConfig
+
+
+class FakeConnection:
+    """Records queries; reads answer from the configured signals and hit limits"""
+
+    def __init__(self, signals, hit_entries=()):
+        self.signals = signals
+        self.hit_entries = list(hit_entries)
+        self.calls = []
+
+    def _signal_rows(self, ids):
+        return [{"id": i, "status": self.signals[i]["status"]} for i in ids if i in self.signals]
+
+    async def fetch(self, query, *args):
+        self.calls.append(("fetch", query, args))
+        if "FROM limits" in query:
+            return [{"effective_price": entry} for entry in self.hit_entries]
+        return self._signal_rows(args[0])
+
+    async def fetchrow(self, query, *args):
+        self.calls.append(("fetchrow", query, args))
+        return self.signals.get(args[0])
+
+    async def execute(self, query, *args):
+        self.calls.append(("execute", query, args))
+
+    async def executemany(self, query, rows):
+        self.calls.append(("executemany", query, list(rows)))
+
+
+class FakeDBManager:
+    def __init__(self, signals, hit_entries=()):
+        self.conn = FakeConnection(signals, hit_entries)
+        self.connections = 0
+
+    async def fetch_all(self, query, params=None):
+        self.conn.calls.append(("fetch_all", query, params))
+        return self.conn._signal_rows(params[0])
+
+    @asynccontextmanager
+    async def get_connection(self):
+        self.connections += 1
+        yield self.conn
+
+
+def _statuses(**by_id):
+    return {int(k[1:]): {"status": v} for k, v in by_id.items()}
+
+
+def _set_statuses(updates, signals):
+    db_manager = FakeDBManager(signals)
+    results = asyncio.run(LifecycleManager(db_manager).manually_set_signal_statuses(updates, db_manager))
+    return results, db_manager
+
+
+def _writes(db_manager, table=None):
+    return [(query, rows) for kind, query, rows in db_manager.conn.calls
+            if kind in ("execute", "executemany") and (table is None or table in query)]
+
+
+def test_batched_update_reads_and_locks_rows_before_writing():
+    results, db_manager = _set_statuses(
+        [(1, "profit", "r", 10.0, None), (2, "cancelled", "r", None, None)],
+        _statuses(s1="hit", s2="active"),
+    )
+
+    assert results == [True, True]
+    assert db_manager.connections == 1
+    first = db_manager.conn.calls[0]
+    assert first[0] == "fetch"
+    assert "FOR UPDATE" in first[1]
+    assert "::bigint[]" in first[1]
+    assert first[2] == ([1, 2],)
+    assert all(kind == "executemany" for kind, _, _ in db_manager.conn.calls[1:])
+
+
+def test_batched_update_records_old_status():
+    results, db_manager = _set_statuses([(7, "breakeven", "moderator", None, None)], _statuses(s7="hit"))
+
+    assert results == [True]
+    inserts = [rows for _, rows in _writes(db_manager, "status_changes")]
+    assert inserts == [[(7, "hit", "breakeven", "manual", "moderator")]]
+
+
+def test_batched_update_skips_unknown_invalid_and_unchanged():
+    results, db_manager = _set_statuses(
+        [(1, "profit", None, None, None), (2, "bogus", None, None, None), (3, "hit", None, None, None)],
+        _statuses(s1="profit", s2="active"),
+    )
+
+    # Unchanged counts as success; an invalid status or missing signal fails
+    assert results == [True, False, False]
+    assert _writes(db_manager) == []
+
+
+def test_batched_update_rejects_duplicate_signal_ids_without_querying():
+    results, db_manager = _set_statuses(
+        [(1, "profit", None, None, None), (1, "breakeven", None, None, None)],
+        _statuses(s1="hit"),
+    )
+
+    assert results == [False, False]
+    assert db_manager.conn.calls == []
+
+
+def _signal(status="hit", stop_loss=1.0800, scalp=False):
+    return {1: {"id": 1, "status": status, "instrument": "EURUSD", "direction": "long",
+                "stop_loss": stop_loss, "scalp": scalp}}
+
+
+def _close_as_stoploss(signals, hit_entries=(), calculator=None):
+    db_manager = FakeDBManager(signals, hit_entries)
+    calls = []
+
+    def record(*args, **kwargs):
+        calls.append((args, kwargs))
+        return calculator(*args, **kwargs) if calculator else -25.0
+
+    ok = asyncio.run(LifecycleManager(db_manager).close_signal_as_stoploss(1, "by mod", db_manager, record))
+    return ok, db_manager, calls
+
+
+def test_stoploss_records_pnl_of_hit_limits_at_the_stop_price():
+    ok, db_manager, calls = _close_as_stoploss(_signal(), hit_entries=[1.0850, None, 1.0830])
+
+    assert ok is True
+    # Hit limits without an entry price are skipped
+    assert calls == [(("EURUSD", "long", [1.0850, 1.0830], 1.0800), {"scalp": False})]
+    signal_update = _writes(db_manager, "UPDATE signals")
+    assert len(signal_update) == 1
+    assert signal_update[0][1][0] == "stop_loss"
+    assert signal_update[0][1][2] == -25.0
+
+
+def test_stoploss_uses_tp_config_batch_pnl(tmp_path):
+    tp_config = TPConfig(str(tmp_path / "tp_configuration.json"))
+    ok, db_manager, _ = _close_as_stoploss(
+        _signal(), hit_entries=[1.0850, 1.0830], calculator=tp_config.calculate_pnl_batch
+    )
+
+    assert ok is True
+    # (1.0800 - 1.0850) + (1.0800 - 1.0830) = -80 pips
+    assert _writes(db_manager, "UPDATE signals")[0][1][2] == pytest.approx(-80.0)
+
+
+def test_stoploss_locks_signal_and_writes_everything_in_one_transaction():
+    ok, db_manager, _ = _close_as_stoploss(_signal(status="active"), hit_entries=[1.0850])
+
+    assert ok is True
+    assert db_manager.connections == 1
+    first = db_manager.conn.calls[0]
+    assert first[0] == "fetchrow" and "FOR UPDATE" in first[1]
+    status_change = _writes(db_manager, "status_changes")
+    assert status_change == [(status_change[0][0], (1, "active", "stop_loss", "by mod"))]
+    cancel = _writes(db_manager, "UPDATE limits")
+    assert len(cancel) == 1 and "status = 'pending'" in cancel[0][0]
+
+
+def test_stoploss_without_hit_limits_or_stop_records_no_pnl():
+    for signals, hit_entries in ((_signal(), []), (_signal(stop_loss=None), [1.0850])):
+        ok, db_manager, calls = _close_as_stoploss(signals, hit_entries)
+
+        assert ok is True
+        assert calls == []
+        assert _writes(db_manager, "UPDATE signals")[0][1][2] is None
+
+
+def test_stoploss_still_closes_when_pnl_calculation_fails():
+    def fail(*args, **kwargs):
+        raise ValueError("no pip size")
+
+    ok, db_manager, _ = _close_as_stoploss(_signal(), hit_entries=[1.0850], calculator=fail)
+
+    assert ok is True
+    assert _writes(db_manager, "UPDATE signals")[0][1][2] is None
+
+
+def test_stoploss_is_a_no_op_for_closed_or_missing_signals():
+    ok, db_manager, calls = _close_as_stoploss(_signal(status="stop_loss"), hit_entries=[1.0850])
+    assert ok is True
+    assert calls == [] and _writes(db_manager) == []
+
+    ok, db_manager, _ = _close_as_stoploss({}, hit_entries=[1.0850])
+    assert ok is False
+    assert _writes(db_manager) == []
@@ -0,0 +1,98 @@
+"""
+Tests for SignalStatusBatcher
+"""
+import asyncio
+
+import pytest
+
+pytest.importorskip("dotenv")
+pytest.importorskip("asyncpg")
+
+from database.signal_operations.status_batcher import SignalStatusBatcher
+
+
+class FakeSignalDB:
+    """Records batched writes; updates with status "invalid" fail"""
+
+    def __init__(self, error=None):
+        self.error = error
+        self.batches = []
+
+    async def manually_set_signal_status_many(self, updates):
+        self.batches.append(list(updates))
+        if self.error:
+            raise self.error
+        return [update[1] != "invalid" for update in updates]
+
+
+def test_resolves_each_waiter_with_its_own_result():
+    async def run():
+        signal_db = FakeSignalDB()
+        batcher = SignalStatusBatcher(signal_db)
+        try:
+            return signal_db, await asyncio.gather(
+                batcher.set_status(1, "profit"),
+                batcher.set_status(2, "invalid"),
+                batcher.set_status(3, "breakeven"),
+            )
+        finally:
+            await batcher.stop()
+
+    signal_db, results = asyncio.run(run())
+
+    assert results == [True, False, True]
+    assert len(signal_db.batches) == 1
+    assert [u[0] for u in signal_db.batches[0]] == [1, 2, 3]
+
+
+def test_repeat_signal_waits_for_the_next_batch():
+    async def run():
+        signal_db = FakeSignalDB()
+        batcher = SignalStatusBatcher(signal_db)
+        try:
+            results = await asyncio.gather(
+                batcher.set_status(1, "hit"),
+                batcher.set_status(1, "profit"),
+            )
+            return signal_db, results
+        finally:
+            await batcher.stop()
+
+    signal_db, results = asyncio.run(run())
+
+    assert results == [True, True]
+    assert [[u[1] for u in batch] for batch in signal_db.batches] == [["hit"], ["profit"]]
+
+
+def test_failed_write_reports_false_to_every_waiter():
+    async def run():
+        batcher = SignalStatusBatcher(FakeSignalDB(error=RuntimeError("db down")))
+        try:
+            return await asyncio.gather(
+                batcher.set_status(1, "profit"),
+                batcher.set_status(2, "profit"),
+            )
+        finally:
+            await batcher.stop()
+
+    assert asyncio.run(run()) == [False, False]
+
+
+def test_cancelled_waiter_is_never_written():
+    async def run():
+        signal_db = FakeSignalDB()
+        batcher = SignalStatusBatcher(signal_db)
+        try:
+            abandoned = asyncio.ensure_future(batcher.set_status(1, "profit"))
+            kept = asyncio.ensure_future(batcher.set_status(2, "breakeven"))
+            await asyncio.sleep(0)
+            # Same as command_timeout firing while the update is still queued
+            abandoned.cancel()
+            return signal_db, await kept
+        finally:
+            await batcher.stop()
+
+    signal_db, result = asyncio.run(run())
+
+    assert result is True
+    assert [[u[0] for u in batch] for batch in signal_db.batches] == [[2]]
@@ -0,0 +1,40 @@
+"""
+Tests for TPConfig P&L calculation
+"""
+import pytest
+
+from price_feeds.tp_config import TPConfig
+
+
+@pytest.fixture
+def tp_config(tmp_path):
+    return TPConfig(str(tmp_path / "tp_configuration.json"))
+
+
+@pytest.mark.parametrize("symbol, direction, entries, price, scalp", [
+    ("EURUSD", "long", [1.0850, 1.0830, 1.0810], 1.0870, False),
+    ("USDJPY", "short", [151.20, 151.50], 150.90, False),
+    ("XAUUSD", "long", [2350.0, 2345.5], 2340.25, True),
+    ("NAS100USD", "short", [18250.0], 18200.0, False),
+])
+def test_batch_pnl_matches_sum_of_single_pnl(tp_config, symbol, direction, entries, price, scalp):
+    expected = sum(
+        tp_config.calculate_pnl(symbol, direction, entry, price, scalp=scalp) for entry in entries
+    )
+    actual = tp_config.calculate_pnl_batch(symbol, direction, entries, price, scalp=scalp)
+
+    assert actual == pytest.approx(expected)
+
+
+def test_batch_pnl_of_no_entries_is_zero(tp_config):
+    assert tp_config.calculate_pnl_batch("EURUSD", "long", [], 1.0850) == 0.0
+
+
+def test_override_changes_invalidate_resolved_entries(tp_config):
+    assert tp_config.get_tp_value("EURUSD") == 10.0
+
+    tp_config.set_override("eurusd", 7.0, "pips")
+    assert tp_config.get_tp_value("EURUSD") == 7.0
+
+    tp_config.remove_override("EURUSD")
+    assert tp_config.get_tp_value("EURUSD") == 10.0
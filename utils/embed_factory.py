@@ -166,6 +166,45 @@ class EmbedFactory:
 
         return embed
 
+    @staticmethod
+    def profit_alert(signal: Dict[str, Any], marked_by: str, profit_text: str = None,
+                     message_link: str = None) -> discord.Embed:
+        """Create the profit-channel embed for a signal marked as profit"""
+        embed = discord.Embed(
+            title="💰 PROFIT Alert",
+            description=f"Signal #{signal['id']} has been marked as **PROFIT**",
+            color=0x00FF00,  # Green
+            timestamp=discord.utils.utcnow()
+        )
+
+        embed.add_field(name="Symbol", value=signal['instrument'], inline=True)
+        embed.add_field(name="Position", value=signal['direction'].upper(), inline=True)
+
+        if profit_text:
+            embed.add_field(name="Profit", value=f"**{profit_text}**", inline=True)
+        else:
+            embed.add_field(name="Status", value="✅ Profit", inline=True)
+
+        if signal.get('entry_price'):
+            embed.add_field(name="Entry", value=f"{signal['entry_price']}", inline=True)
+
+        if signal.get('limits'):
+            limits_text = [
+                f"~~{limit['price_level']}~~ ✅" if limit.get('status') == 'hit' else str(limit['price_level'])
+                for limit in signal['limits'][:3]  # Show max 3
+            ]
+            embed.add_field(name="Limits", value="\n".join(limits_text), inline=True)
+
+        if signal.get('stop_loss'):
+            embed.add_field(name="Stop Loss", value=signal['stop_loss'], inline=True)
+
+        embed.set_footer(text=f"Marked by {marked_by}")
+
+        if message_link:
+            embed.add_field(name="Original Signal", value=f"[View Message]({message_link})", inline=False)
+
+        return embed
+
     @staticmethod
     def bot_status(stats: Dict[str, Any], bot_info: Dict[str, Any]) -> discord.Embed:
         """Create a comprehensive bot status embed"""